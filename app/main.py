@@ -1,20 +1,42 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import os
-import sqlite3
+import queue
+import stat
+import sys
+import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Dict, FrozenSet, Iterator, List, Mapping, Optional, Tuple
 
 import csv
 import io
 import json
-import math
+import re
 
-from fastapi import Body, FastAPI, HTTPException, Query, UploadFile, File, Response
+from fastapi import Body, FastAPI, HTTPException, Query, Request, UploadFile, File, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from pathlib import Path
 
+# Prefer the bundled, more recent SQLite from pysqlite3-binary (FTS5, JSON1,
+# newer planner) when installed; otherwise use the stdlib module.
+try:
+    import pysqlite3 as sqlite3
+
+    sys.modules["sqlite3"] = sqlite3
+except ImportError:
+    import sqlite3
+
 # =============================================================================
 # Config
 # =============================================================================
@@ -22,6 +44,8 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parent
 DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "records.db"
 DB_PATH = os.environ.get("VINYL_DB", str(DEFAULT_DB_PATH))
+# Resolved once; relative cover_local paths are stored relative to this folder
+DB_DIR = Path(DB_PATH).parent
 
 DISCOGS_API = "https://api.discogs.com"
 DISCOGS_TOKEN = os.environ.get("DISCOGS_TOKEN")  # optional
@@ -32,7 +56,68 @@ REQUEST_TIMEOUT = float(os.environ.get("REQUEST_TIMEOUT", "20"))
 # App
 # =============================================================================
 
-app = FastAPI(title="Vinyl API")
+try:
+    import orjson
+except Exception:  # fall back to stdlib json
+    orjson = None
+
+try:
+    from rapidfuzz import fuzz, utils as fuzz_utils
+except Exception:  # fall back to exact substring matching
+    fuzz = None
+
+# Optional dependencies, imported once. Features that need a missing one raise
+# a 500 naming it on first use instead of breaking startup. torch/clip stay
+# lazy in get_clip_model(): they take seconds to import and most processes
+# never match a cover.
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+except ImportError as e:
+    requests = None
+    _REQUESTS_ERROR: Optional[ImportError] = e
+else:
+    _REQUESTS_ERROR = None
+
+try:
+    import httpx
+except ImportError as e:
+    httpx = None
+    _HTTPX_ERROR: Optional[ImportError] = e
+else:
+    _HTTPX_ERROR = None
+
+try:
+    import numpy
+except ImportError as e:
+    numpy = None
+    _NUMPY_ERROR: Optional[ImportError] = e
+else:
+    _NUMPY_ERROR = None
+
+try:
+    from PIL import Image
+except ImportError as e:
+    Image = None
+    _PIL_ERROR: Optional[ImportError] = e
+else:
+    _PIL_ERROR = None
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson (several times faster than stdlib json
+    on the large /api/records payloads).
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+app = FastAPI(title="Vinyl API", default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -69,83 +154,308 @@ def api_health() -> Dict[str, Any]:
 # DB helpers
 # =============================================================================
 
-def db() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
+# Applied to every new connection. journal_mode is persisted in the file, but
+# synchronous/cache/temp_store/busy_timeout/mmap are per-connection settings.
+SQLITE_PRAGMAS: Tuple[str, ...] = (
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA busy_timeout = 30000",
+    "PRAGMA mmap_size = 268435456",
+)
+
+# Connections are pooled so concurrent handlers (sync endpoints run in a
+# threadpool) each get their own handle with a warm page cache. WAL lets
+# readers proceed alongside the single writer; busy_timeout queues writers.
+DB_POOL_SIZE = max(1, int(os.environ.get("VINYL_DB_POOL_SIZE", "8")))
+_POOL: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+_POOL_LOCK = threading.Lock()
+_POOL_OPENED = 0
+# The connection leased by the current thread, so nested db() blocks (helpers
+# calling helpers) reuse it instead of taking a second one from the pool.
+_LEASE = threading.local()
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=256)
     conn.row_factory = sqlite3.Row
-    try:
-        conn.execute("PRAGMA foreign_keys = ON")
-    except Exception:
-        pass
+    for pragma in SQLITE_PRAGMAS:
+        # fall back silently if a pragma is unsupported
+        try:
+            conn.execute(pragma)
+        except Exception:
+            pass
     return conn
 
 
-def init_db() -> None:
-    conn = db()
-    # Enable WAL mode for better concurrency; fall back silently if unsupported
+def _lease_conn() -> sqlite3.Connection:
+    global _POOL_OPENED
     try:
-        conn.execute("PRAGMA journal_mode=WAL;")
-        conn.execute("PRAGMA synchronous=NORMAL;")
-    except Exception:
+        return _POOL.get_nowait()
+    except queue.Empty:
         pass
+    with _POOL_LOCK:
+        if _POOL_OPENED < DB_POOL_SIZE:
+            _POOL_OPENED += 1
+            return _connect()
+    # Pool fully opened and all handles busy: wait for one to come back (LIFO
+    # hands out the most recently used, i.e. cache-warm, connection first)
+    return _POOL.get()
 
-    cur = conn.cursor()
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS records (
-          id INTEGER PRIMARY KEY AUTOINCREMENT,
-          artist TEXT,
-          title TEXT,
-          year INTEGER,
-          label TEXT,
-          format TEXT,
-          country TEXT,
-          location TEXT,
-          catalog_number TEXT,
-          barcode TEXT,
-          discogs_id INTEGER,
-          discogs_release_id INTEGER,
-          discogs_thumb TEXT,
-          cover_url TEXT,
-          cover_local TEXT,
-          cover_url_auto TEXT,
-          album_notes TEXT,
-          personal_notes TEXT,
-          sort_mode TEXT,
-          created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-          updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+
+def warm_db_pool() -> None:
+    global _POOL_OPENED
+    with _POOL_LOCK:
+        while _POOL_OPENED < DB_POOL_SIZE:
+            _POOL.put_nowait(_connect())
+            _POOL_OPENED += 1
+
+
+@contextmanager
+def db() -> Iterator[sqlite3.Connection]:
+    """
+    Lease a pooled connection for the duration of the block.
+    Commits when the outermost block exits cleanly, rolls back on error.
+    """
+    conn = getattr(_LEASE, "conn", None)
+    if conn is not None:
+        yield conn
+        return
+    conn = _lease_conn()
+    _LEASE.conn = conn
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        _LEASE.conn = None
+        _POOL.put_nowait(conn)
+
+
+def close_db() -> None:
+    global _POOL_OPENED
+    with _POOL_LOCK:
+        first = True
+        while True:
+            try:
+                conn = _POOL.get_nowait()
+            except queue.Empty:
+                break
+            if first:
+                # Refresh planner statistics (cheap; only analyzes tables that need it)
+                try:
+                    conn.execute("PRAGMA optimize")
+                except Exception:
+                    pass
+                first = False
+            conn.close()
+            _POOL_OPENED -= 1
+
+
+def init_db() -> None:
+    with db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS records (
+              id INTEGER PRIMARY KEY AUTOINCREMENT,
+              artist TEXT,
+              title TEXT,
+              year INTEGER,
+              label TEXT,
+              format TEXT,
+              country TEXT,
+              location TEXT,
+              catalog_number TEXT,
+              barcode TEXT,
+              discogs_id INTEGER,
+              discogs_release_id INTEGER,
+              discogs_thumb TEXT,
+              cover_url TEXT,
+              cover_local TEXT,
+              cover_url_auto TEXT,
+              album_notes TEXT,
+              personal_notes TEXT,
+              sort_mode TEXT,
+              created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+              updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
         )
-        """
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tracks (
+              id INTEGER PRIMARY KEY AUTOINCREMENT,
+              record_id INTEGER NOT NULL REFERENCES records(id) ON DELETE CASCADE,
+              side TEXT,
+              position TEXT,
+              title TEXT,
+              duration TEXT
+            )
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cover_embeddings (
+              record_id INTEGER PRIMARY KEY REFERENCES records(id) ON DELETE CASCADE,
+              vec TEXT NOT NULL,
+              updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+              vec_blob BLOB,
+              vec_dim INTEGER
+            )
+            """
+        )
+        # Discogs search responses (zlib-compressed JSON), shared across restarts
+        # and worker processes; see discogs_search_async
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS search_cache (
+              key TEXT PRIMARY KEY,
+              response BLOB NOT NULL,
+              expires_at INTEGER NOT NULL
+            )
+            """
+        )
+        cur.execute("DELETE FROM search_cache WHERE expires_at <= ?", (int(time.time()),))
+        # Older databases predate the binary columns; vec keeps their JSON until
+        # get_all_cover_embeddings migrates the row.
+        emb_cols = {r[1] for r in cur.execute("PRAGMA table_info(cover_embeddings)")}
+        if "vec_blob" not in emb_cols:
+            cur.execute("ALTER TABLE cover_embeddings ADD COLUMN vec_blob BLOB")
+        if "vec_dim" not in emb_cols:
+            cur.execute("ALTER TABLE cover_embeddings ADD COLUMN vec_dim INTEGER")
+        # Small key/value counters. cover_embeddings_version is bumped by
+        # triggers on every embedding change (including ON DELETE CASCADE from
+        # records), so each process can tell when its cached cover index is stale.
+        cur.execute("CREATE TABLE IF NOT EXISTS kv (k TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        cur.execute("INSERT OR IGNORE INTO kv (k, value) VALUES ('cover_embeddings_version', 0)")
+        for name, event in (("ai", "INSERT"), ("au", "UPDATE OF vec_blob, vec_dim"), ("ad", "DELETE")):
+            cur.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS cover_embeddings_version_{name}
+                AFTER {event} ON cover_embeddings BEGIN
+                  UPDATE kv SET value = value + 1 WHERE k = 'cover_embeddings_version';
+                END
+                """
+            )
+        # Match the ORDER BY expressions used by list_records / export_records
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_records_artist_title_nocase "
+            "ON records(artist COLLATE NOCASE, title COLLATE NOCASE, id)"
+        )
+        # One index per remaining list sort key, so no sort needs a temp b-tree
+        for col in ("title", "label", "country", "location"):
+            cur.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_records_{col}_nocase ON records({col} COLLATE NOCASE)"
+            )
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_records_year ON records(year)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_records_created ON records(created_at)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_records_updated ON records(updated_at)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_records_discogs_release_id ON records(discogs_release_id)")
+        # Serves track lookups and the ON DELETE CASCADE from records
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_tracks_record_id ON tracks(record_id)")
+        # cover_embeddings.record_id is its INTEGER PRIMARY KEY (the rowid), so the
+        # build-missing LEFT JOIN is already an index probe.
+        init_records_fts(conn)
+    _records_schema.cache_clear()
+
+
+# Columns mirrored into the records_fts full-text index (searched by list_records)
+FTS_COLUMNS: Tuple[str, ...] = (
+    "artist",
+    "title",
+    "label",
+    "country",
+    "location",
+    "catalog_number",
+    "barcode",
+)
+
+# False when the SQLite build lacks FTS5; list_records then falls back to LIKE
+_HAS_FTS = False
+
+
+def init_records_fts(conn: sqlite3.Connection) -> None:
+    """
+    Create the external-content FTS5 table over records plus the triggers that
+    keep it in sync. Backfills from records the first time it is created, and
+    rebuilds tables/triggers created by older versions of this function.
+    """
+    global _HAS_FTS
+    cols = ", ".join(FTS_COLUMNS)
+    new_cols = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+    old_cols = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+    existing = dict(
+        conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE name IN ('records_fts', 'records_fts_au')"
+        ).fetchall()
     )
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS tracks (
-          id INTEGER PRIMARY KEY AUTOINCREMENT,
-          record_id INTEGER NOT NULL REFERENCES records(id) ON DELETE CASCADE,
-          side TEXT,
-          position TEXT,
-          title TEXT,
-          duration TEXT
+    exists = "records_fts" in existing
+    if exists and "prefix" not in (existing["records_fts"] or ""):
+        # Created before prefix indexes were added; recreate and backfill
+        conn.execute("DROP TABLE records_fts")
+        exists = False
+    if "UPDATE OF" not in (existing.get("records_fts_au") or ""):
+        conn.execute("DROP TRIGGER IF EXISTS records_fts_au")
+    try:
+        # prefix='2 3': the list search appends * to every word, so keep
+        # 2- and 3-character prefix indexes instead of scanning the term list
+        conn.execute(
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS records_fts USING fts5(
+              {cols},
+              content='records',
+              content_rowid='id',
+              tokenize='unicode61 remove_diacritics 2',
+              prefix='2 3'
+            )
+            """
         )
+    except sqlite3.OperationalError:
+        _HAS_FTS = False
+        return
+
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS records_fts_ai AFTER INSERT ON records BEGIN
+          INSERT INTO records_fts(rowid, {cols}) VALUES (new.id, {new_cols});
+        END
         """
     )
-    cur.execute(
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS records_fts_ad AFTER DELETE ON records BEGIN
+          INSERT INTO records_fts(records_fts, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+        END
         """
-        CREATE TABLE IF NOT EXISTS cover_embeddings (
-          record_id INTEGER PRIMARY KEY REFERENCES records(id) ON DELETE CASCADE,
-          vec TEXT NOT NULL,
-          updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS records_fts_au AFTER UPDATE OF {cols} ON records BEGIN
+          INSERT INTO records_fts(records_fts, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+          INSERT INTO records_fts(rowid, {cols}) VALUES (new.id, {new_cols});
+        END
         """
     )
-    conn.commit()
-    conn.close()
+    if not exists:
+        conn.execute("INSERT INTO records_fts(records_fts) VALUES ('rebuild')")
+    _HAS_FTS = True
 
 
 @app.on_event("startup")
 def on_startup() -> None:
-    base = os.path.dirname(DB_PATH) or "."
-    os.makedirs(base, exist_ok=True)
+    DB_DIR.mkdir(parents=True, exist_ok=True)
     init_db()
+    warm_db_pool()
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    close_db()
 
 
 # =============================================================================
@@ -160,102 +470,150 @@ def fetch_record(conn: sqlite3.Connection, rid: int) -> sqlite3.Row:
 
 
 def db_get_record_or_404(rid: int) -> Dict[str, Any]:
-    conn = db()
-    row = fetch_record(conn, rid)
-    out = dict(row)
-    conn.close()
-    return out
+    with db() as conn:
+        return dict(fetch_record(conn, rid))
+
+
+# Columns accepted on insert, in a fixed order so batch inserts share one statement
+RECORD_INSERT_COLUMNS: Tuple[str, ...] = (
+    "artist",
+    "title",
+    "year",
+    "label",
+    "format",
+    "country",
+    "location",
+    "catalog_number",
+    "barcode",
+    "discogs_id",
+    "discogs_release_id",
+    "discogs_thumb",
+    "cover_url",
+    "cover_local",
+    "cover_url_auto",
+    "album_notes",
+    "personal_notes",
+    "sort_mode",
+)
+
+_RECORD_COLUMN_SET = frozenset(RECORD_INSERT_COLUMNS)
+
+# Constant SQL text so sqlite3's per-connection statement cache is always hit
+_INSERT_RECORD_SQL = (
+    f"INSERT INTO records ({', '.join(RECORD_INSERT_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in RECORD_INSERT_COLUMNS)})"
+)
+_INSERT_RECORD_RETURNING_SQL = _INSERT_RECORD_SQL + " RETURNING *"
+
+# UPDATE statements keyed by the set of patched columns (in practice only a
+# handful of distinct sets); values are bound in sorted column order.
+_PATCH_SQL_CACHE: Dict[FrozenSet[str], Tuple[str, Tuple[str, ...]]] = {}
+
+
+# UPDATE/INSERT ... RETURNING needs SQLite >= 3.35
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+def _patch_sql(keys: FrozenSet[str]) -> Tuple[str, Tuple[str, ...]]:
+    hit = _PATCH_SQL_CACHE.get(keys)
+    if hit is None:
+        cols = tuple(sorted(keys))
+        sets = ", ".join(f"{c} = ?" for c in cols)
+        sql = f"UPDATE records SET {sets}, updated_at = CURRENT_TIMESTAMP WHERE id = ?"
+        if _HAS_RETURNING:
+            sql += " RETURNING *"
+        hit = (sql, cols)
+        _PATCH_SQL_CACHE[keys] = hit
+    return hit
 
 
 def db_patch_record(rid: int, payload: Dict[str, Any]) -> Dict[str, Any]:
-    if not payload:
+    """
+    Update only the given columns and return the updated row (404 if missing).
+    Unknown keys (id, timestamps, ...) are ignored.
+    """
+    keys = frozenset(payload) & _RECORD_COLUMN_SET
+    if not keys:
         return db_get_record_or_404(rid)
 
-    conn = db()
-    cur = conn.cursor()
-    cols, vals = [], []
-    for k, v in payload.items():
-        cols.append(f"{k} = ?")
-        vals.append(v)
-    cols.append("updated_at = CURRENT_TIMESTAMP")
-    cur.execute(f"UPDATE records SET {', '.join(cols)} WHERE id = ?", (*vals, rid))
-    conn.commit()
-    row = fetch_record(conn, rid)
-    out = dict(row)
-    conn.close()
-    return out
+    sql, cols = _patch_sql(keys)
+    with db() as conn:
+        cur = conn.execute(sql, (*(payload[c] for c in cols), rid))
+        if not _HAS_RETURNING:
+            return dict(fetch_record(conn, rid))
+        row = cur.fetchone()
+    if not row:
+        raise HTTPException(404, detail="Record not found")
+    return dict(row)
 
 
 def db_insert_record(payload: Dict[str, Any]) -> Dict[str, Any]:
-    conn = db()
-    cur = conn.cursor()
-    keys = list(payload.keys())
-    vals = [payload[k] for k in keys]
-    placeholders = ", ".join("?" for _ in keys)
-    cur.execute(
-        f"INSERT INTO records ({', '.join(keys)}) VALUES ({placeholders})",
-        tuple(vals),
-    )
-    rid = cur.lastrowid
-    conn.commit()
-    row = fetch_record(conn, rid)
-    out = dict(row)
-    conn.close()
-    return out
+    params = tuple(payload.get(c) for c in RECORD_INSERT_COLUMNS)
+    with db() as conn:
+        if _HAS_RETURNING:
+            # The stored row (defaults and timestamps filled in) without a re-select
+            return dict(conn.execute(_INSERT_RECORD_RETURNING_SQL, params).fetchone())
+        cur = conn.execute(_INSERT_RECORD_SQL, params)
+        return dict(fetch_record(conn, cur.lastrowid))
+
+
+def db_insert_records(rows: List[Dict[str, Any]]) -> int:
+    """
+    Insert many records in a single transaction (one commit for the whole batch).
+    Missing keys are stored as NULL.
+    """
+    if not rows:
+        return 0
+    # Parameters are generated as executemany consumes them; no second list
+    params = (tuple(r.get(c) for c in RECORD_INSERT_COLUMNS) for r in rows)
+    with db() as conn:
+        cur = conn.executemany(_INSERT_RECORD_SQL, params)
+    return cur.rowcount
+
+
+# Ids are bound as one JSON array, so every delete shares a single cached
+# statement (no per-length SQL) and there is no bound-variable limit
+_DELETE_RECORDS_SQL = "DELETE FROM records WHERE id IN (SELECT value FROM json_each(?))"
 
 
 def db_delete_records(ids: List[int]) -> int:
     if not ids:
         return 0
-    conn = db()
-    cur = conn.cursor()
-    placeholders = ", ".join("?" for _ in ids)
-    cur.execute(f"DELETE FROM records WHERE id IN ({placeholders})", tuple(ids))
-    deleted = cur.rowcount
-    conn.commit()
-    conn.close()
+    with db() as conn:
+        cur = conn.execute(_DELETE_RECORDS_SQL, (json.dumps([int(i) for i in ids]),))
+        deleted = cur.rowcount
     return deleted
 
 
+TRACK_COLS: Tuple[str, ...] = ("id", "record_id", "side", "position", "title", "duration")
+_SELECT_TRACKS_SQL = f"SELECT {', '.join(TRACK_COLS)} FROM tracks WHERE record_id = ? ORDER BY id"
+
+
 def db_get_tracks(rid: int) -> List[Dict[str, Any]]:
-    conn = db()
-    cur = conn.cursor()
-    rows = cur.execute(
-        "SELECT id, record_id, side, position, title, duration FROM tracks WHERE record_id = ? ORDER BY id",
-        (rid,),
-    ).fetchall()
-    out = [dict(r) for r in rows]
-    conn.close()
-    return out
+    with db() as conn:
+        cur = conn.cursor()
+        cur.row_factory = None  # plain tuples; zipped with TRACK_COLS below
+        rows = cur.execute(_SELECT_TRACKS_SQL, (rid,)).fetchall()
+    return [dict(zip(TRACK_COLS, r)) for r in rows]
+
+
+_INSERT_TRACK_SQL = "INSERT INTO tracks (record_id, side, position, title, duration) VALUES (?, ?, ?, ?, ?)"
 
 
 def db_replace_tracks(rid: int, tracks: List[Dict[str, Any]]) -> None:
-    conn = db()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM tracks WHERE record_id = ?", (rid,))
-    for t in tracks:
-        cur.execute(
-            """
-            INSERT INTO tracks (record_id, side, position, title, duration)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (
-                rid,
-                t.get("side"),
-                t.get("position"),
-                t.get("title"),
-                t.get("duration"),
-            ),
-        )
-    conn.commit()
-    conn.close()
+    params = [
+        (rid, t.get("side"), t.get("position"), t.get("title"), t.get("duration"))
+        for t in tracks
+    ]
+    # DELETE + INSERTs commit together as one transaction
+    with db() as conn:
+        conn.execute("DELETE FROM tracks WHERE record_id = ?", (rid,))
+        conn.executemany(_INSERT_TRACK_SQL, params)
 
 
 def bump_record_updated(rid: int) -> None:
-    conn = db()
-    conn.execute("UPDATE records SET updated_at = CURRENT_TIMESTAMP WHERE id = ?", (rid,))
-    conn.commit()
-    conn.close()
+    with db() as conn:
+        conn.execute("UPDATE records SET updated_at = CURRENT_TIMESTAMP WHERE id = ?", (rid,))
 
 
 # =============================================================================
@@ -327,6 +685,17 @@ def like_pattern(s: str) -> str:
     return f"%{s.replace('%', '%%')}%"
 
 
+_FTS_TOKEN_RE = re.compile(r"\w+")
+
+
+def fts_match_query(s: str) -> str:
+    """
+    Turn free-text search into an FTS5 MATCH expression: every word must match
+    as a prefix in some indexed column. Returns "" if there are no words.
+    """
+    return " ".join(f'"{tok}"*' for tok in _FTS_TOKEN_RE.findall(s))
+
+
 def _nz(x: Any) -> str:
     if x is None:
         return ""
@@ -337,12 +706,11 @@ def _nz(x: Any) -> str:
 # Meta
 # =============================================================================
 
-@app.get("/api/meta/schema")
-def meta_schema() -> Dict[str, Any]:
-    conn = db()
-    cur = conn.cursor()
-    rows = cur.execute("PRAGMA table_info(records)").fetchall()
-    conn.close()
+@lru_cache(maxsize=1)
+def _records_schema() -> Dict[str, Any]:
+    # The schema only changes in init_db(), which clears this cache
+    with db() as conn:
+        rows = conn.execute("PRAGMA table_info(records)").fetchall()
     cols = []
     for r in rows:
         cols.append(
@@ -358,53 +726,212 @@ def meta_schema() -> Dict[str, Any]:
     return {"columns": cols}
 
 
+@app.get("/api/meta/schema")
+def meta_schema() -> Dict[str, Any]:
+    return _records_schema()
+
+
 @app.get("/api/meta/records/schema")
 def meta_records_schema() -> Dict[str, Any]:
-    return meta_schema()
+    return _records_schema()
 
 
 # =============================================================================
 # Records listing + CRUD
 # =============================================================================
 
-@app.get("/api/records")
+TEXT_SORT_KEYS = frozenset({"artist", "title", "label", "country", "location"})
+
+# Columns the list views use; notes and Discogs ids are only returned by
+# GET /api/records/{rid}.
+LIST_COLS: Tuple[str, ...] = (
+    "id",
+    "artist",
+    "title",
+    "year",
+    "label",
+    "format",
+    "country",
+    "location",
+    "catalog_number",
+    "barcode",
+    "cover_url",
+    "cover_local",
+    "cover_url_auto",
+    "discogs_thumb",
+    "sort_mode",
+    "updated_at",
+)
+_LIST_COLS_SQL = ", ".join(LIST_COLS)
+
+ALLOWED_SORT_KEYS = ("artist", "title", "year", "label", "country", "location", "created_at", "updated_at")
+
+_LIST_WHERE: Dict[str, str] = {
+    "none": "",
+    "fts": "WHERE id IN (SELECT rowid FROM records_fts WHERE records_fts MATCH ?)",
+    "like": (
+        "WHERE (artist LIKE ? OR title LIKE ? OR label LIKE ? OR country LIKE ? "
+        "OR location LIKE ? OR catalog_number LIKE ? OR barcode LIKE ?)"
+    ),
+}
+
+
+def _build_list_sql() -> Dict[Tuple[str, str, str], str]:
+    # (search mode, sort key, dir) -> items_sql. Built once so the handler
+    # never formats SQL, and sqlite3's statement cache always hits.
+    out: Dict[Tuple[str, str, str], str] = {}
+    for mode, where_sql in _LIST_WHERE.items():
+        sql_base = f"FROM records {where_sql}".rstrip()
+        for key in ALLOWED_SORT_KEYS:
+            # Text columns sort case-insensitively; numeric/timestamp columns sort
+            # as-is. Each ORDER BY matches an index from init_db (the rowid is the
+            # implicit last index column, so the id tie-break follows the
+            # direction and DESC is a backwards scan).
+            collate = " COLLATE NOCASE" if key in TEXT_SORT_KEYS else ""
+            for direction in ("ASC", "DESC"):
+                order = f"{key}{collate} {direction}"
+                if key == "artist":
+                    order += f", title COLLATE NOCASE {direction}"
+                out[(mode, key, direction)] = (
+                    f"SELECT {_LIST_COLS_SQL} {sql_base} ORDER BY {order}, id {direction}"
+                )
+    return out
+
+
+_LIST_SQL = _build_list_sql()
+
+_LIST_COUNT_SQL: Dict[str, str] = {
+    mode: f"SELECT COUNT(*) FROM records {where_sql}".rstrip() for mode, where_sql in _LIST_WHERE.items()
+}
+
+# Keyset ("seek") pages for the default artist sort. SQLite sorts NULL first, so
+# an ASC walk is the NULL-artist rows then the rest, and DESC the reverse. Each
+# segment is queried separately so the non-NULL one keeps a bare range bound on
+# artist, which is what lets the planner seek into the artist/title/id index
+# instead of scanning up to the cursor.
+_KEYSET_SEGMENTS: Dict[str, Tuple[str, str]] = {"ASC": ("null", "value"), "DESC": ("value", "null")}
+
+_KEYSET_TITLE_AFTER: Dict[Tuple[str, bool], str] = {
+    # (direction, cursor title is NULL) -> rows after the cursor within one artist
+    ("ASC", False): "(title COLLATE NOCASE > ? OR (title COLLATE NOCASE = ? AND id > ?))",
+    ("ASC", True): "(title IS NOT NULL OR id > ?)",
+    ("DESC", False): "(title COLLATE NOCASE < ? OR title IS NULL OR (title COLLATE NOCASE = ? AND id < ?))",
+    ("DESC", True): "(title IS NULL AND id < ?)",
+}
+
+
+@lru_cache(maxsize=None)
+def _keyset_sql(mode: str, direction: str, segment: str, seek: bool, title_null: bool) -> str:
+    if segment == "null":
+        cond = "artist IS NULL"
+        if seek:
+            cond += f" AND {_KEYSET_TITLE_AFTER[(direction, title_null)]}"
+    elif seek:
+        ge, gt = (">=", ">") if direction == "ASC" else ("<=", "<")
+        cond = (
+            f"artist COLLATE NOCASE {ge} ? AND (artist COLLATE NOCASE {gt} ? OR "
+            f"(artist COLLATE NOCASE = ? AND {_KEYSET_TITLE_AFTER[(direction, title_null)]}))"
+        )
+    else:
+        cond = "artist IS NOT NULL"
+    where_sql = _LIST_WHERE[mode]
+    where_sql = f"{where_sql} AND {cond}" if where_sql else f"WHERE {cond}"
+    order = f"artist COLLATE NOCASE {direction}, title COLLATE NOCASE {direction}, id {direction}"
+    return f"SELECT {_LIST_COLS_SQL} FROM records {where_sql} ORDER BY {order} LIMIT ?"
+
+
+def _keyset_page(
+    cur: sqlite3.Cursor,
+    mode: str,
+    params: Tuple[Any, ...],
+    direction: str,
+    after: Optional[Tuple[Optional[str], Optional[str], int]],
+    limit: int,
+) -> List[Tuple[Any, ...]]:
+    """
+    Up to `limit` rows of the artist-sorted listing that follow `after`
+    (artist, title, id), or from the start when `after` is None.
+    """
+    segments = _KEYSET_SEGMENTS[direction]
+    if after is not None:
+        artist, title, rid = after
+        segments = segments[segments.index("null" if artist is None else "value"):]
+        title_params = (rid,) if title is None else (title, title, rid)
+        seek_params = title_params if artist is None else (artist, artist, artist) + title_params
+    rows: List[Tuple[Any, ...]] = []
+    for i, segment in enumerate(segments):
+        seek = after is not None and i == 0
+        sql = _keyset_sql(mode, direction, segment, seek, seek and after[1] is None)
+        rows += cur.execute(sql, params + (seek_params if seek else ()) + (limit - len(rows),)).fetchall()
+        if len(rows) >= limit:
+            break
+    return rows
+
+
+@app.get("/api/records", response_model=None)
 def list_records(
     search: Optional[str] = Query(None),
     sort_key: Optional[str] = Query("artist"),
     sort_dir: Optional[str] = Query("asc"),
     limit: int = Query(500, ge=1, le=5000),
     offset: int = Query(0, ge=0),
-) -> Dict[str, Any]:
-    where_clauses: List[str] = []
-    params: List[Any] = []
-
-    if search:
-        like = like_pattern(search)
-        where_clauses.append(
-            "(artist LIKE ? OR title LIKE ? OR label LIKE ? OR country LIKE ? OR location LIKE ? OR catalog_number LIKE ? OR barcode LIKE ?)"
-        )
-        params.extend([like, like, like, like, like, like, like])
-
-    where_sql = ""
-    if where_clauses:
-        where_sql = "WHERE " + " AND ".join(where_clauses)
-
-    allowed_sort = {"artist", "title", "year", "label", "country", "location", "created_at", "updated_at"}
-    if sort_key not in allowed_sort:
+    after_artist: Optional[str] = Query(None),
+    after_title: Optional[str] = Query(None),
+    after_id: Optional[int] = Query(None, ge=0),
+) -> ORJSONResponse:
+    params: Tuple[Any, ...] = ()
+    mode = "none"
+    match = fts_match_query(search) if (search and _HAS_FTS) else ""
+    if match:
+        mode = "fts"
+        params = (match,)
+    elif search:
+        mode = "like"
+        params = (like_pattern(search),) * 7
+
+    if sort_key not in ALLOWED_SORT_KEYS:
         sort_key = "artist"
     sort_dir = "DESC" if (sort_dir or "").lower() == "desc" else "ASC"
 
-    conn = db()
-    cur = conn.cursor()
-    sql_base = f"FROM records {where_sql}"
-    total = cur.execute(f"SELECT COUNT(*) {sql_base}", params).fetchone()[0]
-
-    sql = f"SELECT * {sql_base} ORDER BY {sort_key} COLLATE NOCASE {sort_dir}, id"
-    rows = cur.execute(sql, (*params,)).fetchall()
-    conn.close()
-
-    items = [dict(r) for r in rows]
-    return {"items": items, "total": total}
+    if after_id is not None:
+        # Cursor paging: after_id=0 asks for the first page, later pages pass
+        # back the next_cursor of the previous one. Without a cursor the whole
+        # match set is returned, which is what the UI relies on.
+        if sort_key != "artist":
+            raise HTTPException(status_code=400, detail="Cursor paging is only supported for sort_key=artist")
+        after = (after_artist, after_title, after_id) if after_id else None
+        with db() as conn:
+            cur = conn.cursor()
+            cur.row_factory = None
+            total = cur.execute(_LIST_COUNT_SQL[mode], params).fetchone()[0]
+            if not total and mode == "fts":
+                mode, params = "like", (like_pattern(search),) * 7
+                total = cur.execute(_LIST_COUNT_SQL[mode], params).fetchone()[0]
+            rows = _keyset_page(cur, mode, params, sort_dir, after, limit) if total else []
+        items = [dict(zip(LIST_COLS, r)) for r in rows]
+        next_cursor = None
+        if len(items) == limit:
+            last = items[-1]
+            next_cursor = {"after_artist": last["artist"], "after_title": last["title"], "after_id": last["id"]}
+        return ORJSONResponse({"items": items, "total": total, "next_cursor": next_cursor})
+
+    sql = _LIST_SQL[(mode, sort_key, sort_dir)]
+
+    with db() as conn:
+        cur = conn.cursor()
+        cur.row_factory = None  # plain tuples; cheaper than sqlite3.Row here
+        rows = cur.execute(sql, params).fetchall()
+        if not rows and mode == "fts":
+            # FTS only matches word prefixes; retry as a substring search so
+            # e.g. the middle of a catalog number or barcode still finds the record
+            like_sql = _LIST_SQL[("like", sort_key, sort_dir)]
+            rows = cur.execute(like_sql, (like_pattern(search),) * 7).fetchall()
+
+    # The query returns every match, so its length is the total; no separate
+    # COUNT(*) pass over the same WHERE clause.
+    # Rows are plain str/int/None: serialize directly, skipping jsonable_encoder
+    items = [dict(zip(LIST_COLS, r)) for r in rows]
+    return ORJSONResponse({"items": items, "total": len(items)})
 
 
 def derive_year_from_release_detail(detail: Dict[str, Any]) -> Optional[int]:
@@ -423,16 +950,44 @@ def derive_year_from_release_detail(detail: Dict[str, Any]) -> Optional[int]:
         return None
 
 
+# release_id -> year (None when Discogs has no usable year). Release years never
+# change, so lookups are cached for the life of the process.
+_RELEASE_YEAR_CACHE: Dict[int, Optional[int]] = {}
+
+
 def derive_year_from_discogs_release(release_id: Optional[int]) -> Optional[int]:
     if not release_id:
         return None
     try:
-        detail = discogs_release_details(int(release_id))
+        rel_id = int(release_id)
+    except Exception:
+        return None
+    if rel_id in _RELEASE_YEAR_CACHE:
+        return _RELEASE_YEAR_CACHE[rel_id]
+    try:
+        detail = discogs_release_details(rel_id)
     except HTTPException:
         return None
     except Exception:
         return None
-    return derive_year_from_release_detail(detail)
+    year = derive_year_from_release_detail(detail)
+    _RELEASE_YEAR_CACHE[rel_id] = year
+    return year
+
+
+def derive_years_for_releases(release_ids: List[int], max_workers: int = 8) -> Dict[int, Optional[int]]:
+    """
+    Resolve years for many release ids at once: deduplicated, served from the
+    cache where possible, the rest fetched concurrently (_http_get applies the
+    Discogs rate limit).
+    """
+    ids = set(release_ids)
+    todo = [r for r in ids if r not in _RELEASE_YEAR_CACHE]
+
+    if todo:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(derive_year_from_discogs_release, todo))
+    return {r: _RELEASE_YEAR_CACHE.get(r) for r in ids}
 
 
 @app.post("/api/records")
@@ -443,7 +998,8 @@ def create_record(payload: RecordIn = Body(...)) -> Dict[str, Any]:
     if not (payload.format or "").strip():
         payload.format = "LP"
 
-    data = payload.dict()
+    # Unset/None fields are simply absent; db_insert_record stores them as NULL
+    data = payload.model_dump(exclude_none=True)
     # If no year but we have a Discogs release/record id, try to derive a year
     if not data.get("year"):
         release_id = data.get("discogs_release_id") or data.get("discogs_id")
@@ -454,20 +1010,14 @@ def create_record(payload: RecordIn = Body(...)) -> Dict[str, Any]:
     return db_insert_record(data)
 
 
-@app.get("/api/records/{rid}")
-def get_record(rid: int) -> Dict[str, Any]:
-    return db_get_record_or_404(rid)
+@app.get("/api/records/{rid}", response_model=None)
+def get_record(rid: int) -> ORJSONResponse:
+    return ORJSONResponse(db_get_record_or_404(rid))
 
 
 @app.patch("/api/records/{rid}")
 def patch_record(rid: int, payload: RecordPatch = Body(...)) -> Dict[str, Any]:
-    existing = db_get_record_or_404(rid)
-    update_data = payload.dict(exclude_unset=True)
-    merged = dict(existing)
-    for k, v in update_data.items():
-        merged[k] = v
-    merged.pop("id", None)
-    return db_patch_record(rid, merged)
+    return db_patch_record(rid, payload.model_dump(exclude_unset=True))
 
 
 @app.delete("/api/records/{rid}")
@@ -519,64 +1069,89 @@ def meta_import_template() -> Response:
     )
 
 
-@app.get("/api/records-export")
-def export_records() -> Response:
-    conn = db()
-    cur = conn.cursor()
-    rows = cur.execute(
-        "SELECT * FROM records ORDER BY artist COLLATE NOCASE, title COLLATE NOCASE, id"
-    ).fetchall()
-
-    headers = [
-        "id",
-        "artist",
-        "title",
-        "year",
-        "label",
-        "format",
-        "country",
-        "location",
-        "sort_mode",
-        "catalog_number",
-        "barcode",
-        "discogs_id",
-        "discogs_release_id",
-        "discogs_thumb",
-        "cover_url",
-        "cover_local",
-        "cover_url_auto",
-        "album_notes",
-        "personal_notes",
-        "created_at",
-        "updated_at",
-    ]
+EXPORT_COLS: Tuple[str, ...] = (
+    "id",
+    "artist",
+    "title",
+    "year",
+    "label",
+    "format",
+    "country",
+    "location",
+    "sort_mode",
+    "catalog_number",
+    "barcode",
+    "discogs_id",
+    "discogs_release_id",
+    "discogs_thumb",
+    "cover_url",
+    "cover_local",
+    "cover_url_auto",
+    "album_notes",
+    "personal_notes",
+    "created_at",
+    "updated_at",
+)
+_EXPORT_SQL = (
+    f"SELECT {', '.join(EXPORT_COLS)} FROM records "
+    "ORDER BY artist COLLATE NOCASE, title COLLATE NOCASE, id"
+)
+EXPORT_BATCH_ROWS = 500
+EXPORT_CHUNK_CHARS = 64 * 1024
 
-    buf = io.StringIO()
-    writer = csv.writer(buf)
-    writer.writerow(headers)
-    for r in rows:
-        row = [r["id"]]
-        for col in headers[1:]:
-            row.append(r[col])
-        writer.writerow(row)
 
-    csv_bytes = buf.getvalue().encode("utf-8")
-    conn.close()
-    return Response(
-        content=csv_bytes,
+@app.get("/api/records-export")
+def export_records() -> StreamingResponse:
+    def gen() -> Iterator[bytes]:
+        # Dedicated connection so a pooled one isn't held while the client reads
+        conn = _connect()
+        # Columns are selected in header order, so tuple rows go straight to csv
+        conn.row_factory = None
+        try:
+            cur = conn.execute(_EXPORT_SQL)
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            writer.writerow(EXPORT_COLS)
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+            # Hand csv whole batches of rows and send ~64 KB chunks, whatever
+            # the row width; memory stays flat
+            while True:
+                rows = cur.fetchmany(EXPORT_BATCH_ROWS)
+                if not rows:
+                    break
+                writer.writerows(rows)
+                if buf.tell() >= EXPORT_CHUNK_CHARS:
+                    yield buf.getvalue().encode("utf-8")
+                    buf.seek(0)
+                    buf.truncate()
+            if buf.tell():
+                yield buf.getvalue().encode("utf-8")
+        finally:
+            conn.close()
+
+    return StreamingResponse(
+        gen(),
         media_type="text/csv",
         headers={"Content-Disposition": 'attachment; filename="vinyl_records_export.csv"'},
     )
 
 
 @app.post("/api/import/csv")
-async def import_csv(file: UploadFile = File(...)) -> Dict[str, Any]:
+async def import_csv(
+    file: UploadFile = File(...),
+    derive_years: bool = Query(False),
+) -> Dict[str, Any]:
     """
     Import CSV rows into the records table.
 
     Defaults:
       - country -> "US" if missing/blank
       - format  -> "LP" if missing/blank
+
+    With ?derive_years=true, rows without a year but with a Discogs release id
+    get their year looked up on Discogs (one request per distinct release).
     """
 
     def to_int_or_none(v: Any) -> Optional[int]:
@@ -597,114 +1172,96 @@ async def import_csv(file: UploadFile = File(...)) -> Dict[str, Any]:
             return ""
         return str(s).strip()
 
-    raw_bytes = await file.read()
+    def read_records(stream: Any) -> List[Dict[str, Any]]:
+        reader = csv.reader(stream)
+        try:
+            header = next(reader)
+        except StopIteration:
+            raise HTTPException(400, detail="CSV file is empty")
+
+        header_map: Dict[str, str] = {}
+        for col in header:
+            key = (col or "").strip().lower()
+            if not key:
+                continue
+            header_map[key] = col
+
+        required = ["artist", "title"]
+        for r in required:
+            if r not in header_map:
+                raise HTTPException(400, detail=f"Missing required column '{r}'")
+
+        # Resolve each known column's position and converter once, not per row
+        int_fields = {"year", "discogs_id", "discogs_release_id"}
+        plan: List[Tuple[int, str, Any]] = [
+            (header.index(orig_col), key, to_int_or_none if key in int_fields else nz)
+            for key, orig_col in header_map.items()
+            if key in _RECORD_COLUMN_SET
+        ]
+
+        batch: List[Dict[str, Any]] = []
+        for row in reader:
+            n = len(row)
+            rec: Dict[str, Any] = {key: fn(row[idx] if idx < n else "") for idx, key, fn in plan}
+
+            artist = nz(rec.get("artist"))
+            title = nz(rec.get("title"))
+            if not artist or not title:
+                continue
+
+            if "country" not in rec or not nz(rec["country"]):
+                rec["country"] = "US"
+            if "format" not in rec or not nz(rec["format"]):
+                rec["format"] = "LP"
+
+            batch.append(rec)
+        return batch
 
-    def decode_csv_bytes(b: bytes) -> str:
+    def parse_upload() -> List[Dict[str, Any]]:
+        # Starlette has already spooled the upload to a file; parse it as text
+        # straight from there rather than copying it into bytes, a str and a
+        # StringIO first.
         # Handle common encodings produced by Excel/Numbers/Sheets exports.
-        # Order matters: try UTFs first, then Windows-1252 as a pragmatic fallback.
-        if not b:
-            return ""
+        # Order matters: try UTFs first, then Windows-1252 as a pragmatic
+        # fallback. A decode error part-way through restarts with the next one.
+        upload = file.file
+        upload.seek(0)
+        encodings = ["utf-8-sig", "utf-8", "cp1252", "cp1250", "latin-1"]
         # UTF-16 BOM sniff
-        if b.startswith(b"\xff\xfe") or b.startswith(b"\xfe\xff"):
-            try:
-                return b.decode("utf-16")
-            except Exception:
-                pass
-        for enc in ("utf-8-sig", "utf-8", "cp1252", "cp1250", "latin-1"):
+        if upload.read(2) in (b"\xff\xfe", b"\xfe\xff"):
+            encodings.insert(0, "utf-16")
+        for enc in encodings:
+            upload.seek(0)
+            stream = io.TextIOWrapper(upload, encoding=enc, newline="")
             try:
-                return b.decode(enc)
-            except Exception:
+                return read_records(stream)
+            except UnicodeDecodeError:
                 continue
+            finally:
+                # Leave the upload open; FastAPI closes it after the request
+                stream.detach()
         raise HTTPException(
             400,
             detail="Could not decode CSV (tried UTF-8/UTF-16/Windows-1252). Please export as CSV UTF-8.",
         )
 
-    text = decode_csv_bytes(raw_bytes)
-
-    reader = csv.reader(io.StringIO(text))
-    try:
-        header = next(reader)
-    except StopIteration:
-        raise HTTPException(400, detail="CSV file is empty")
-
-    header_map: Dict[str, str] = {}
-    for col in header:
-        key = (col or "").strip().lower()
-        if not key:
-            continue
-        header_map[key] = col
-
-    required = ["artist", "title"]
-    for r in required:
-        if r not in header_map:
-            raise HTTPException(400, detail=f"Missing required column '{r}'")
-
-    rows_imported = 0
-    for row in reader:
-        rec: Dict[str, Any] = {}
-        for key, orig_col in header_map.items():
-            idx = header.index(orig_col)
-            val = row[idx] if idx < len(row) else ""
-
-            if key == "artist":
-                rec["artist"] = nz(val)
-            elif key == "title":
-                rec["title"] = nz(val)
-            elif key == "year":
-                rec["year"] = to_int_or_none(val)
-            elif key == "label":
-                rec["label"] = nz(val)
-            elif key == "format":
-                rec["format"] = nz(val)
-            elif key == "country":
-                rec["country"] = nz(val)
-            elif key == "location":
-                rec["location"] = nz(val)
-            elif key == "catalog_number":
-                rec["catalog_number"] = nz(val)
-            elif key == "barcode":
-                rec["barcode"] = nz(val)
-            elif key == "discogs_id":
-                rec["discogs_id"] = to_int_or_none(val)
-            elif key == "discogs_release_id":
-                rec["discogs_release_id"] = to_int_or_none(val)
-            elif key == "discogs_thumb":
-                rec["discogs_thumb"] = nz(val)
-            elif key == "cover_url":
-                rec["cover_url"] = nz(val)
-            elif key == "cover_local":
-                rec["cover_local"] = nz(val)
-            elif key == "cover_url_auto":
-                rec["cover_url_auto"] = nz(val)
-            elif key == "album_notes":
-                rec["album_notes"] = nz(val)
-            elif key == "personal_notes":
-                rec["personal_notes"] = nz(val)
-            elif key == "sort_mode":
-                rec["sort_mode"] = nz(val)
-
-        artist = nz(rec.get("artist"))
-        title = nz(rec.get("title"))
-        if not artist or not title:
-            continue
-
-        if "country" not in rec or not nz(rec["country"]):
-            rec["country"] = "US"
-        if "format" not in rec or not nz(rec["format"]):
-            rec["format"] = "LP"
-
-        # Derive year from Discogs if missing
-        if not rec.get("year"):
-            release_id = rec.get("discogs_release_id") or rec.get("discogs_id")
-            if release_id is not None:
-                yr = derive_year_from_discogs_release(release_id)
-                if yr is not None:
-                    rec["year"] = yr
-
-        db_insert_record(rec)
-        rows_imported += 1
-
+    batch = await asyncio.to_thread(parse_upload)
+
+    # Derive missing years from Discogs in one concurrent pass
+    if derive_years:
+        wanted = [
+            (rec, rec.get("discogs_release_id") or rec.get("discogs_id"))
+            for rec in batch
+            if not rec.get("year")
+        ]
+        wanted = [(rec, rel_id) for rec, rel_id in wanted if rel_id]
+        if wanted:
+            years = await asyncio.to_thread(derive_years_for_releases, [rel_id for _, rel_id in wanted])
+            for rec, rel_id in wanted:
+                if years.get(rel_id) is not None:
+                    rec["year"] = years[rel_id]
+
+    rows_imported = await asyncio.to_thread(db_insert_records, batch)
     return {"added": rows_imported, "imported": rows_imported}
 
 
@@ -712,10 +1269,10 @@ async def import_csv(file: UploadFile = File(...)) -> Dict[str, Any]:
 # Tracks APIs
 # =============================================================================
 
-@app.get("/api/records/{rid}/tracks")
-def api_get_tracks(rid: int) -> List[Dict[str, Any]]:
+@app.get("/api/records/{rid}/tracks", response_model=None)
+def api_get_tracks(rid: int) -> ORJSONResponse:
     _ = db_get_record_or_404(rid)
-    return db_get_tracks(rid)
+    return ORJSONResponse(db_get_tracks(rid))
 
 
 @app.post("/api/records/{rid}/tracks/replace")
@@ -731,33 +1288,310 @@ def api_tracks_replace(rid: int, body: TracksReplaceIn) -> Dict[str, Any]:
 # Discogs HTTP helpers
 # =============================================================================
 
-def _discogs_headers() -> Dict[str, str]:
-    h = {"User-Agent": USER_AGENT}
-    if DISCOGS_TOKEN:
-        h["Authorization"] = f"Discogs token={DISCOGS_TOKEN}"
-    return h
+# Fixed for the life of the process; installed as default headers on both the
+# requests session and the httpx client.
+_DISCOGS_HEADERS: Mapping[str, str] = MappingProxyType(
+    {
+        "User-Agent": USER_AGENT,
+        **({"Authorization": f"Discogs token={DISCOGS_TOKEN}"} if DISCOGS_TOKEN else {}),
+    }
+)
+_NO_PARAMS: Mapping[str, Any] = MappingProxyType({})
+
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens/second, bursts of up to `burst`.
+    acquire() blocks until a token is available; acquire_async() awaits instead
+    of blocking the event loop. Both draw from the same tokens.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _take(self) -> float:
+        # Takes a token and returns 0, or returns how long until one is due
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self) -> None:
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+
+# Discogs allows 60 authenticated requests/minute
+_DISCOGS_BUCKET = _TokenBucket(rate=1.0, burst=5)
+
+# Caps concurrent release-detail fetches when scoring search results. Created
+# on the running event loop (a fresh one per loop) rather than at import time,
+# so a second loop (e.g. another TestClient) never hits one bound elsewhere.
+DISCOGS_FANOUT = 8
+_DISCOGS_FANOUT: Optional[asyncio.Semaphore] = None
+_DISCOGS_FANOUT_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _discogs_fanout() -> asyncio.Semaphore:
+    global _DISCOGS_FANOUT, _DISCOGS_FANOUT_LOOP
+    loop = asyncio.get_running_loop()
+    if _DISCOGS_FANOUT is None or _DISCOGS_FANOUT_LOOP is not loop:
+        _DISCOGS_FANOUT = asyncio.Semaphore(DISCOGS_FANOUT)
+        _DISCOGS_FANOUT_LOOP = loop
+    return _DISCOGS_FANOUT
+
+
+_HTTP_SESSION = None
+_HTTP_SESSION_LOCK = threading.Lock()
+
+
+def _http_session():
+    """
+    Lazily create one process-wide requests.Session so Discogs API calls and
+    cover image downloads reuse keep-alive connections (no TCP+TLS handshake
+    per call). Transient errors and 429s are retried with backoff by the
+    mounted adapter.
+    """
+    global _HTTP_SESSION
+    if _HTTP_SESSION is not None:
+        return _HTTP_SESSION
+    if requests is None:
+        raise HTTPException(500, detail=f"'requests' not installed: {_REQUESTS_ERROR}")
+
+    with _HTTP_SESSION_LOCK:
+        if _HTTP_SESSION is None:
+            session = requests.Session()
+            session.headers.update(_DISCOGS_HEADERS)
+            retry = Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["GET"],
+                respect_retry_after_header=True,
+            )
+            # Sized for the Discogs API host plus its image CDN under concurrent
+            # cover downloads
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _HTTP_SESSION = session
+    return _HTTP_SESSION
+
 
+def _http_get(url: str, params: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+    # The token travels in the session's Authorization header, so plan
+    # mappings are passed through as-is
+    session = _http_session()
+    _DISCOGS_BUCKET.acquire()
 
-def _http_get(url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     try:
-        import requests
+        resp = session.get(url, params=params or _NO_PARAMS, timeout=REQUEST_TIMEOUT)
+        resp.raise_for_status()
+        return resp.json()
     except Exception as e:
-        raise HTTPException(500, detail=f"'requests' not installed: {e}")
+        raise HTTPException(502, detail=f"Discogs HTTP error: {e}")
 
-    p = dict(params or {})
-    if DISCOGS_TOKEN and "token" not in p:
-        p["token"] = DISCOGS_TOKEN
+
+# Shared async client for handlers that await Discogs instead of blocking a
+# worker thread. Created on startup, closed on shutdown.
+_ASYNC_HTTP = None
+
+
+def _async_http():
+    global _ASYNC_HTTP
+    if _ASYNC_HTTP is None:
+        if httpx is None:
+            raise HTTPException(500, detail=f"'httpx' not installed: {_HTTPX_ERROR}")
+        kwargs: Dict[str, Any] = {
+            "headers": _DISCOGS_HEADERS,
+            "timeout": REQUEST_TIMEOUT,
+            "limits": httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            # requests follows redirects by default and httpx doesn't; cover
+            # URLs often bounce through a CDN or http -> https
+            "follow_redirects": True,
+        }
+        try:
+            _ASYNC_HTTP = httpx.AsyncClient(http2=True, **kwargs)
+        except ImportError:
+            # 'h2' not installed; HTTP/1.1 keep-alive still applies
+            _ASYNC_HTTP = httpx.AsyncClient(**kwargs)
+    return _ASYNC_HTTP
+
+
+async def _http_get_async(url: str, params: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+    client = _async_http()
+    await _DISCOGS_BUCKET.acquire_async()
 
     try:
-        resp = requests.get(url, headers=_discogs_headers(), params=p, timeout=REQUEST_TIMEOUT)
+        resp = await client.get(url, params=params or _NO_PARAMS)
         resp.raise_for_status()
         return resp.json()
     except Exception as e:
         raise HTTPException(502, detail=f"Discogs HTTP error: {e}")
 
 
+@app.on_event("startup")
+def on_startup_http() -> None:
+    _async_http()
+
+
+@app.on_event("shutdown")
+async def on_shutdown_http() -> None:
+    global _ASYNC_HTTP
+    if _ASYNC_HTTP is not None:
+        await _ASYNC_HTTP.aclose()
+        _ASYNC_HTTP = None
+
+
+class _TTLCache:
+    """
+    Small thread-safe LRU with per-entry expiry. get() returns None on a miss.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is None:
+                return None
+            expires, value = hit
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# Only the parts of a release the app (and the UI preview) uses are cached;
+# full Discogs release documents are much larger.
+_RELEASE_DETAIL_KEYS: Tuple[str, ...] = (
+    "id",
+    "title",
+    "year",
+    "released",
+    "country",
+    "artists",
+    "formats",
+    "images",
+    "tracklist",
+)
+_RELEASE_CACHE = _TTLCache(maxsize=10_000, ttl=86400)
+
+
 def discogs_release_details(release_id: int) -> Dict[str, Any]:
-    return _http_get(f"{DISCOGS_API}/releases/{release_id}")
+    detail = _RELEASE_CACHE.get(release_id)
+    if detail is None:
+        js = _http_get(f"{DISCOGS_API}/releases/{release_id}")
+        detail = {k: js[k] for k in _RELEASE_DETAIL_KEYS if k in js}
+        _RELEASE_CACHE.set(release_id, detail)
+    return detail
+
+
+async def discogs_release_details_async(release_id: int) -> Dict[str, Any]:
+    detail = _RELEASE_CACHE.get(release_id)
+    if detail is None:
+        js = await _http_get_async(f"{DISCOGS_API}/releases/{release_id}")
+        detail = {k: js[k] for k in _RELEASE_DETAIL_KEYS if k in js}
+        _RELEASE_CACHE.set(release_id, detail)
+    return detail
+
+
+# Search responses keyed by their query parameters. Short-lived: Discogs
+# results shift as the catalog is edited, but the UI commonly repeats the same
+# search within seconds (fetch cover, then save tracks for one record).
+# In-process hits come from _SEARCH_CACHE; misses fall back to the
+# search_cache table so restarts and other workers don't re-query Discogs.
+SEARCH_CACHE_TTL = 600
+_SEARCH_CACHE = _TTLCache(maxsize=2048, ttl=SEARCH_CACHE_TTL)
+
+
+def _search_cache_key(params: Mapping[str, Any]) -> str:
+    canon = "&".join(f"{k}={v}" for k, v in sorted((str(k), str(v)) for k, v in params.items()))
+    return hashlib.blake2b(canon.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# The persistent cache is best-effort: a locked or unreadable table is a miss,
+# never a failed search.
+
+def db_search_cache_get(key: str) -> Optional[Dict[str, Any]]:
+    try:
+        with db() as conn:
+            row = conn.execute(
+                "SELECT response FROM search_cache WHERE key = ? AND expires_at > ?",
+                (key, int(time.time())),
+            ).fetchone()
+        if row is None:
+            return None
+        raw = zlib.decompress(row[0])
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except (sqlite3.Error, zlib.error, ValueError):
+        return None
+
+
+def db_search_cache_put(key: str, js: Dict[str, Any]) -> None:
+    raw = orjson.dumps(js) if orjson is not None else json.dumps(js).encode("utf-8")
+    now = int(time.time())
+    try:
+        with db() as conn:
+            # Expired rows are swept on every write so a long-running server
+            # doesn't accumulate them; searches are rate limited to ~1/s, so
+            # the live table stays at a few hundred rows at most
+            conn.execute("DELETE FROM search_cache WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, response, expires_at) VALUES (?, ?, ?)",
+                (key, zlib.compress(raw), now + SEARCH_CACHE_TTL),
+            )
+    except sqlite3.Error:
+        pass
+
+
+async def discogs_search_async(params: Mapping[str, Any]) -> Dict[str, Any]:
+    key = frozenset(params.items())
+    js = _SEARCH_CACHE.get(key)
+    if js is not None:
+        return js
+
+    db_key = _search_cache_key(params)
+    js = await asyncio.to_thread(db_search_cache_get, db_key)
+    if js is None:
+        js = await _http_get_async(f"{DISCOGS_API}/database/search", params)
+        await asyncio.to_thread(db_search_cache_put, db_key, js)
+    _SEARCH_CACHE.set(key, js)
+    return js
 
 
 def _fmt_tokens_from_release_detail(detail: Dict[str, Any]) -> List[str]:
@@ -769,14 +1603,13 @@ def _fmt_tokens_from_release_detail(detail: Dict[str, Any]) -> List[str]:
     return tokens
 
 
+# required_country is always a country_pref() value, i.e. already upper-case,
+# so the per-candidate checks below only normalize the candidate side.
+
 def candidate_allowed_release(detail: Dict[str, Any], required_country: Optional[str]) -> bool:
-    tokens = set(_fmt_tokens_from_release_detail(detail))
-    if "lp" not in tokens:
+    if required_country and _nz(detail.get("country")).upper() != required_country:
         return False
-    if required_country:
-        if _nz(detail.get("country")).upper() != required_country.upper():
-            return False
-    return True
+    return "lp" in _fmt_tokens_from_release_detail(detail)
 
 
 def candidate_allowed_search(item: Dict[str, Any], required_country: Optional[str]) -> bool:
@@ -785,12 +1618,13 @@ def candidate_allowed_search(item: Dict[str, Any], required_country: Optional[st
         return False
     if required_country:
         c = _nz(item.get("country")).upper()
-        if c and c != required_country.upper():
+        if c and c != required_country:
             return False
     return True
 
 
 def country_pref(row: Dict[str, Any]) -> str:
+    """Upper-case country a record's Discogs match must come from (default US)."""
     c = _nz(row.get("country")).upper()
     return c or "US"
 
@@ -823,7 +1657,7 @@ def pick_best_image(detail: Dict[str, Any]) -> Tuple[Optional[str], Optional[str
 # Extra debug endpoint: /api/discogs/search (used in your curl test)
 # -----------------------------------------------------------------------------
 @app.get("/api/discogs/search")
-def api_discogs_search(
+async def api_discogs_search(
     artist: Optional[str] = Query(None),
     release_title: Optional[str] = Query(None),
     q: Optional[str] = Query(None),
@@ -839,142 +1673,228 @@ def api_discogs_search(
     if q:
         params["q"] = q
 
-    js = _http_get(f"{DISCOGS_API}/database/search", params)
-    return js
+    return await discogs_search_async(params)
 
 
 # =============================================================================
 # Discogs search + cover/track logic (used by the UI)
 # =============================================================================
 
-def discogs_query_plan_for_row(row: Dict[str, Any]) -> List[Dict[str, Any]]:
-    artist = _nz(row.get("artist"))
-    title = _nz(row.get("title"))
-    year = _nz(row.get("year"))
-    cat = _nz(row.get("catalog_number"))
-    bc = _nz(row.get("barcode"))
+# Constant part of every search plan; shared, read-only
+_PLAN_LP_BASE: Mapping[str, Any] = MappingProxyType({"type": "release", "format": "LP", "per_page": 50})
+_PLAN_ID_BASE: Mapping[str, Any] = MappingProxyType({"type": "release", "per_page": 50})
+
 
+@lru_cache(maxsize=2048)
+def _query_plans(artist: str, title: str, year: str, cat: str, bc: str) -> Tuple[Mapping[str, Any], ...]:
+    # Most specific first: callers take the first variant that yields a usable
+    # candidate, and a barcode (then catalog number) hit identifies the
+    # pressing far more reliably than a free-text match.
     base_q = f"{artist} {title}".strip()
-    plans: List[Dict[str, Any]] = []
+    plans: List[Mapping[str, Any]] = []
+
+    if bc:
+        plans.append(MappingProxyType({**_PLAN_ID_BASE, "barcode": bc}))
+
+    if cat:
+        plans.append(MappingProxyType({**_PLAN_ID_BASE, "catno": cat}))
 
     if base_q:
-        plans.append(
-            {
-                "q": base_q,
-                "type": "release",
-                "format": "LP",
-                "per_page": 50,
-            }
-        )
+        plans.append(MappingProxyType({**_PLAN_LP_BASE, "q": base_q}))
         if year:
-            plans.append(
-                {
-                    "q": f"{base_q} {year}",
-                    "type": "release",
-                    "format": "LP",
-                    "per_page": 50,
-                }
-            )
+            plans.append(MappingProxyType({**_PLAN_LP_BASE, "q": f"{base_q} {year}"}))
 
-    if cat:
-        plans.append(
-            {
-                "catno": cat,
-                "type": "release",
-                "per_page": 50,
-            }
-        )
+    return tuple(plans)
 
-    if bc:
-        plans.append(
-            {
-                "barcode": bc,
-                "type": "release",
-                "per_page": 50,
-            }
-        )
 
-    return plans
+def discogs_query_plan_for_row(row: Dict[str, Any]) -> Tuple[Mapping[str, Any], ...]:
+    """
+    Discogs search params to try in order. Plans are immutable and memoized on
+    the fields they depend on, so repeated lookups for a record reuse them.
+    """
+    return _query_plans(
+        _nz(row.get("artist")),
+        _nz(row.get("title")),
+        _nz(row.get("year")),
+        _nz(row.get("catalog_number")),
+        _nz(row.get("barcode")),
+    )
 
 
-def discogs_fetch_and_score_candidates(row: Dict[str, Any]) -> List[Tuple[int, int]]:
+def _to_int_or_none(v: Any) -> Optional[int]:
+    try:
+        return int(v) if v is not None else None
+    except Exception:
+        return None
+
+
+async def discogs_search_plan(row: Dict[str, Any]) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Run the row's query variants in plan order, yielding each one's results.
+    Variants are searched one at a time, so a caller that stops iterating once
+    it has a match doesn't spend rate limit on the rest. A variant that fails
+    yields no results unless all of them fail, in which case the first error
+    is raised.
+    """
+    plan = discogs_query_plan_for_row(row)
+    errors: List[Exception] = []
+    for params in plan:
+        try:
+            js = await discogs_search_async(params)
+        except Exception as e:
+            errors.append(e)
+            if len(errors) == len(plan):
+                raise errors[0]
+            yield []
+            continue
+        yield js.get("results") or []
+
+
+# token_sort_ratio (0-100) a name must reach to count as a match when it isn't a
+# plain substring: catches "Beatles, The" vs "The Beatles" and small typos. The
+# scorer is symmetric on purpose; token_set_ratio gives 100 whenever one side's
+# words are a subset of the other's ("Led Zeppelin" vs "Led Zeppelin IV").
+FUZZY_MATCH_MIN = 90
+
+
+def name_matches(needle: str, haystack: str) -> bool:
+    if needle in haystack:
+        return True
+    if fuzz is None:
+        return False
+    return fuzz.token_sort_ratio(needle, haystack, processor=fuzz_utils.default_process) >= FUZZY_MATCH_MIN
+
+
+async def discogs_fetch_and_score_candidates(row: Dict[str, Any]) -> List[Tuple[int, int]]:
     artist = _nz(row.get("artist")).lower()
     title = _nz(row.get("title")).lower()
     country = country_pref(row)
-    year = row.get("year")
+    y_rec = _to_int_or_none(row.get("year"))
+
+    # Best score any release can get for this row; reaching it ends the search
+    max_score = (30 if artist else 0) + (30 if title else 0) + (10 if country else 0) + (10 if y_rec is not None else 0)
 
     def score_candidate(detail: Dict[str, Any]) -> int:
         s = 0
         artists_detail = ", ".join([_nz(a.get("name")) for a in (detail.get("artists") or [])]).lower()
-        if artist and artist in artists_detail:
+        if artist and name_matches(artist, artists_detail):
             s += 30
         title_detail = _nz(detail.get("title")).lower()
-        if title and title in title_detail:
+        if title and name_matches(title, title_detail):
             s += 30
 
-        if country and _nz(detail.get("country")).upper() == country.upper():
+        if country and _nz(detail.get("country")).upper() == country:
             s += 10
 
-        rel_year = detail.get("year")
-        try:
-            y_rec = int(year) if year is not None else None
-        except Exception:
-            y_rec = None
-        try:
-            y_rel = int(rel_year) if rel_year is not None else None
-        except Exception:
-            y_rel = None
+        y_rel = _to_int_or_none(detail.get("year"))
         if y_rec is not None and y_rel is not None and abs(y_rec - y_rel) <= 1:
             s += 10
         return s
 
-    best: List[Tuple[int, int]] = []
-
-    for params in discogs_query_plan_for_row(row):
-        js = _http_get(f"{DISCOGS_API}/database/search", params)
-        for item in js.get("results", []) or []:
-            if not candidate_allowed_search(item, country):
-                continue
-            rel_id = item.get("id")
-            if not rel_id:
-                continue
+    def rank_search_hits(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Cheap guess from the search hits ("Artist - Title", year) so likely
+        # matches are fetched first. Hits are scored pairwise rather than with
+        # process.cdist, which needs numpy (optional here).
+        hit_titles = [_nz(item.get("title")).lower() for item in items]
+        if fuzz is not None:
+            query = f"{artist} {title}"
+            # 0-100 similarity -> 0-2, the same range as the two substring hits
+            name_hints = [
+                fuzz.token_sort_ratio(query, t, processor=fuzz_utils.default_process) / 50 for t in hit_titles
+            ]
+        else:
+            name_hints = [
+                (1 if artist and artist in t else 0) + (1 if title and title in t else 0) for t in hit_titles
+            ]
+
+        def year_hint(item: Dict[str, Any]) -> int:
+            y_hit = _to_int_or_none(item.get("year"))
+            return 1 if y_rec is not None and y_hit is not None and abs(y_rec - y_hit) <= 1 else 0
+
+        hints = [h + year_hint(item) for h, item in zip(name_hints, items)]
+        order = sorted(range(len(items)), key=hints.__getitem__, reverse=True)
+        return [items[i] for i in order]
+
+    async def fetch_detail(pos: int, rel_id: int) -> Tuple[int, int, Optional[Dict[str, Any]]]:
+        async with _discogs_fanout():
             try:
-                detail = discogs_release_details(int(rel_id))
-            except HTTPException:
-                continue
+                return pos, rel_id, await discogs_release_details_async(rel_id)
             except Exception:
-                continue
-
-            if not candidate_allowed_release(detail, country):
-                continue
-
-            s = score_candidate(detail)
-            best.append((int(rel_id), s))
-
-        if best:
+                return pos, rel_id, None
+
+    scored: List[Tuple[int, int, int]] = []  # (score, -position, release id)
+    found_max = False
+
+    # Variants are searched in plan order; the first one yielding a candidate
+    # wins and the rest are never sent
+    async for results in discogs_search_plan(row):
+        items = [item for item in results if candidate_allowed_search(item, country) and item.get("id")]
+        items = rank_search_hits(items)
+
+        # Fetch candidates' details concurrently. Stop once the best-ranked
+        # perfect candidate is known, i.e. every hit ranked above it has been
+        # scored, so the outcome doesn't depend on which response lands first.
+        tasks = [asyncio.ensure_future(fetch_detail(pos, int(item["id"]))) for pos, item in enumerate(items)]
+        pending = set(tasks)
+        finished = [False] * len(tasks)
+        first_pending = 0
+        best_pos: Optional[int] = None
+        try:
+            while pending and not found_max:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pos, rel_id, detail = task.result()
+                    finished[pos] = True
+                    if detail is not None and candidate_allowed_release(detail, country):
+                        s = score_candidate(detail)
+                        scored.append((s, -pos, rel_id))
+                        if s >= max_score and (best_pos is None or pos < best_pos):
+                            best_pos = pos
+                while first_pending < len(finished) and finished[first_pending]:
+                    first_pending += 1
+
+                if best_pos is not None:
+                    found_max = first_pending >= best_pos
+                    # Hits ranked below a perfect one can't win; don't spend
+                    # rate limit fetching them
+                    for task in tasks[best_pos + 1:]:
+                        task.cancel()
+                    pending.difference_update(tasks[best_pos + 1:])
+        finally:
+            for t in tasks:
+                t.cancel()
+
+        if found_max:
+            # Hits ranked below the winner were only scored if they happened to
+            # finish early; drop them so the list is the same on every run
+            scored = [entry for entry in scored if -entry[1] <= best_pos]
+
+        if scored or found_max:
             break
 
-    best.sort(key=lambda x: x[1], reverse=True)
-    return best
+    # Highest score first; ties keep search (hint) order
+    scored.sort(reverse=True)
+    return [(rel_id, s) for s, _, rel_id in scored]
 
 
-def derive_best_release_id_for_record(rid: int) -> Optional[int]:
-    row = db_get_record_or_404(rid)
-    candidates = discogs_fetch_and_score_candidates(row)
+async def derive_best_release_id_for_record(rid: int, row: Optional[Dict[str, Any]] = None) -> Optional[int]:
+    # Endpoints that already loaded the record pass it in to skip a second read
+    if row is None:
+        row = await asyncio.to_thread(db_get_record_or_404, rid)
+    candidates = await discogs_fetch_and_score_candidates(row)
     if not candidates:
         return None
     return candidates[0][0]
 
 
 @app.get("/api/records/{rid}/discogs/search")
-def api_discogs_search_for_record(rid: int) -> Dict[str, Any]:
-    row = db_get_record_or_404(rid)
+async def api_discogs_search_for_record(rid: int) -> Dict[str, Any]:
+    row = await asyncio.to_thread(db_get_record_or_404, rid)
     required_country = country_pref(row)
 
     out: List[Dict[str, Any]] = []
-    for params in discogs_query_plan_for_row(row):
-        js = _http_get(f"{DISCOGS_API}/database/search", params)
-        for r in js.get("results") or []:
+    async for results in discogs_search_plan(row):
+        for r in results:
             if not candidate_allowed_search(r, required_country):
                 continue
             out.append(
@@ -999,19 +1919,18 @@ def api_discogs_release_preview(release_id: int) -> Dict[str, Any]:
 
 
 @app.post("/api/records/{rid}/cover/fetch")
-def api_cover_fetch(rid: int, body: Optional[DiscogsApplyIn] = Body(None)) -> Dict[str, Any]:
-    _ = db_get_record_or_404(rid)
+async def api_cover_fetch(rid: int, body: Optional[DiscogsApplyIn] = Body(None)) -> Dict[str, Any]:
+    row = await asyncio.to_thread(db_get_record_or_404, rid)
 
     if body and body.release_id:
         release_id = int(body.release_id)
     else:
-        release_id = derive_best_release_id_for_record(rid)
+        release_id = await derive_best_release_id_for_record(rid, row)
 
     if not release_id:
         raise HTTPException(404, detail="No suitable Discogs LP release found for required country")
 
-    row = db_get_record_or_404(rid)
-    detail = discogs_release_details(release_id)
+    detail = await discogs_release_details_async(release_id)
     if not candidate_allowed_release(detail, country_pref(row)):
         raise HTTPException(404, detail="Chosen release does not satisfy LP + country constraint")
 
@@ -1019,7 +1938,7 @@ def api_cover_fetch(rid: int, body: Optional[DiscogsApplyIn] = Body(None)) -> Di
     if not row.get("year"):
         yr = derive_year_from_release_detail(detail)
         if yr is not None:
-            db_patch_record(rid, {"year": yr})
+            await asyncio.to_thread(db_patch_record, rid, {"year": yr})
 
     cover_url_auto, discogs_thumb = pick_best_image(detail)
     if not cover_url_auto and not discogs_thumb:
@@ -1032,23 +1951,22 @@ def api_cover_fetch(rid: int, body: Optional[DiscogsApplyIn] = Body(None)) -> Di
     if discogs_thumb:
         payload["discogs_thumb"] = discogs_thumb
 
-    updated = db_patch_record(rid, payload)
+    updated = await asyncio.to_thread(db_patch_record, rid, payload)
     return updated
 
 
 @app.post("/api/records/{rid}/tracks/save")
-def api_tracks_save(rid: int, body: Optional[DiscogsApplyIn] = Body(None)) -> Dict[str, Any]:
-    _ = db_get_record_or_404(rid)
+async def api_tracks_save(rid: int, body: Optional[DiscogsApplyIn] = Body(None)) -> Dict[str, Any]:
+    row = await asyncio.to_thread(db_get_record_or_404, rid)
     if body and body.release_id:
         release_id = int(body.release_id)
     else:
-        release_id = derive_best_release_id_for_record(rid)
+        release_id = await derive_best_release_id_for_record(rid, row)
 
     if not release_id:
         raise HTTPException(404, detail="No suitable Discogs LP release found for required country")
 
-    row = db_get_record_or_404(rid)
-    detail = discogs_release_details(release_id)
+    detail = await discogs_release_details_async(release_id)
     if not candidate_allowed_release(detail, country_pref(row)):
         raise HTTPException(404, detail="Chosen release does not satisfy LP + country constraint")
 
@@ -1056,37 +1974,31 @@ def api_tracks_save(rid: int, body: Optional[DiscogsApplyIn] = Body(None)) -> Di
     if not row.get("year"):
         yr = derive_year_from_release_detail(detail)
         if yr is not None:
-            db_patch_record(rid, {"year": yr})
+            await asyncio.to_thread(db_patch_record, rid, {"year": yr})
 
+    # Already shaped like db_replace_tracks rows (side/position/title/duration)
     tracks = discogs_fetch_tracklist_for_release(release_id, detail)
-    items = [
-        {"side": t["side"], "position": t["position"], "title": t["title"], "duration": t["duration"]}
-        for t in tracks
-    ]
-    db_replace_tracks(rid, items)
-    bump_record_updated(rid)
+    await asyncio.to_thread(db_replace_tracks, rid, tracks)
+    await asyncio.to_thread(bump_record_updated, rid)
     return {"ok": True, "count": len(tracks)}
 
 
 def discogs_fetch_tracklist_for_release(release_id: int, detail: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
     rel = detail or discogs_release_details(release_id)
-    out: List[Dict[str, Any]] = []
-    for t in rel.get("tracklist", []) or []:
-        pos = (t.get("position") or "").strip()
-        title = (t.get("title") or "").strip()
-        duration = (t.get("duration") or "").strip()
-        side = "A"
-        if pos and pos[0].isalpha():
-            side = pos[0].upper()
-        out.append(
-            {
-                "side": side,
-                "position": pos or None,
-                "title": title or "Untitled",
-                "duration": duration or None,
-            }
-        )
-    return out
+    stripped = [
+        ((t.get("position") or "").strip(), (t.get("title") or "").strip(), (t.get("duration") or "").strip())
+        for t in rel.get("tracklist", []) or []
+    ]
+    # Side is the position's leading letter ("B2" -> "B"); numeric positions are side A
+    return [
+        {
+            "side": pos[0].upper() if pos and pos[0].isalpha() else "A",
+            "position": pos or None,
+            "title": title or "Untitled",
+            "duration": duration or None,
+        }
+        for pos, title, duration in stripped
+    ]
 
 
 # =============================================================================
@@ -1096,6 +2008,8 @@ def discogs_fetch_tracklist_for_release(release_id: int, detail: Optional[Dict[s
 _CLIP_MODEL = None
 _CLIP_PREPROCESS = None
 _CLIP_DEVICE = None
+CLIP_TORCH_COMPILE = os.environ.get("CLIP_TORCH_COMPILE", "").lower() in ("1", "true", "yes")
+CLIP_CPU_INT8 = os.environ.get("CLIP_CPU_INT8", "").lower() in ("1", "true", "yes")
 
 
 def get_clip_model():
@@ -1124,129 +2038,478 @@ def get_clip_model():
     else:
         device = "cpu"
 
+    if device == "cuda":
+        # Let cuDNN pick the fastest conv kernels for the patch-embedding layer
+        torch.backends.cudnn.benchmark = True
+
     model_name = os.environ.get("CLIP_MODEL_NAME", "ViT-B/32")
     model, preprocess = clip.load(model_name, device=device)
     model.eval()
 
+    # int8 dynamic quantization of the Linear layers roughly halves CPU latency
+    # but shifts embeddings slightly; opt-in, and rebuild stored embeddings after
+    # switching it on so both sides use the same model.
+    if device == "cpu" and CLIP_CPU_INT8:
+        try:
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        except Exception:
+            pass
+
+    # On CUDA clip.load already keeps fp16 weights and encode_image casts inputs
+    # to match. Compiling the image tower is opt-in: it costs a slow first call
+    # and recompiles for each new batch size.
+    if device == "cuda" and CLIP_TORCH_COMPILE and hasattr(torch, "compile"):
+        try:
+            model.visual = torch.compile(model.visual, mode="reduce-overhead", fullgraph=False)
+            res = int(getattr(model.visual, "input_resolution", 224))
+            with torch.inference_mode():
+                model.encode_image(torch.zeros(1, 3, res, res, device=device))
+        except Exception:
+            # fall back to the eager model
+            model, preprocess = clip.load(model_name, device=device)
+            model.eval()
+
     _CLIP_MODEL = model
     _CLIP_PREPROCESS = preprocess
     _CLIP_DEVICE = device
     return model, preprocess, device
 
 
-def compute_image_embedding(image_bytes: bytes) -> List[float]:
-    try:
-        from PIL import Image
-        import torch
-    except Exception as e:
-        raise HTTPException(500, detail=f"Image/torch dependencies not available: {e}")
+# Images per encode_image() call when (re)building stored embeddings
+CLIP_BATCH_SIZE = int(os.environ.get("CLIP_BATCH_SIZE", "32"))
 
-    from io import BytesIO
 
+def compute_image_embeddings_batch(images: List[bytes]) -> List[Optional[List[float]]]:
+    """
+    Embed several images with one encode_image() call. Decoding/preprocessing
+    runs in a thread pool; entries that fail to decode come back as None.
+    """
+    if Image is None:
+        raise HTTPException(500, detail=f"Image/torch dependencies not available: {_PIL_ERROR}")
+    # get_clip_model() has already imported torch (or raised)
     model, preprocess, device = get_clip_model()
-    img = Image.open(BytesIO(image_bytes)).convert("RGB")
-    img_t = preprocess(img).unsqueeze(0).to(device)
+    import torch
+
+    res = int(getattr(model.visual, "input_resolution", 224))
 
-    with torch.no_grad():
-        features = model.encode_image(img_t)
+    def load(data: bytes):
+        try:
+            img = Image.open(io.BytesIO(data))
+            # Let libjpeg decode at a reduced scale (still >= the model input);
+            # Discogs covers are ~600px, so most of the decode/resize is skipped
+            img.draft("RGB", (res, res))
+            return preprocess(img.convert("RGB"))
+        except Exception:
+            return None
+
+    out: List[Optional[List[float]]] = [None] * len(images)
+    if not images:
+        return out
+    with ThreadPoolExecutor(max_workers=min(8, len(images))) as pool:
+        tensors = list(pool.map(load, images))
+    ok = [i for i, t in enumerate(tensors) if t is not None]
+    if not ok:
+        return out
+
+    batch = torch.stack([tensors[i] for i in ok])
+    if device == "cuda":
+        # Page-locked staging lets the host->GPU copy run as one async DMA
+        batch = batch.pin_memory().to(device, non_blocking=True)
+    else:
+        batch = batch.to(device)
+    with torch.inference_mode():
+        features = model.encode_image(batch)
         features = features / features.norm(dim=-1, keepdim=True)
-        vec: List[float] = features[0].cpu().tolist()
-    return vec
+        vecs: List[List[float]] = features.float().cpu().tolist()
+    for i, vec in zip(ok, vecs):
+        out[i] = vec
+    return out
+
+
+# How long the batcher waits for more uploads before running a partial batch
+CLIP_BATCH_WINDOW = float(os.environ.get("CLIP_BATCH_WINDOW_MS", "20")) / 1000.0
+
+
+class _EmbeddingBatcher:
+    """
+    Coalesces concurrent /api/cover-match uploads into one
+    compute_image_embeddings_batch() call: the first queued image waits up to
+    CLIP_BATCH_WINDOW for others, up to CLIP_BATCH_SIZE per batch. The worker
+    task is started lazily on the running event loop.
+    """
+
+    def __init__(self) -> None:
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def embed(self, image_bytes: bytes) -> List[float]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+        fut: asyncio.Future = loop.create_future()
+        await self._queue.put((image_bytes, fut))
+        return await fut
+
+    async def _run(self) -> None:
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + CLIP_BATCH_WINDOW
+            while len(batch) < CLIP_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                vecs = await asyncio.to_thread(compute_image_embeddings_batch, [b for b, _ in batch])
+            except Exception as e:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+            for (_, fut), vec in zip(batch, vecs):
+                if fut.done():
+                    continue
+                if vec is None:
+                    fut.set_exception(HTTPException(400, detail="Could not decode image"))
+                else:
+                    fut.set_result(vec)
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        self._task = None
+        self._queue = None
+        self._loop = None
+
 
+_EMBED_BATCHER = _EmbeddingBatcher()
 
-def cosine_similarity(a: List[float], b: List[float]) -> float:
-    if not a or not b or len(a) != len(b):
-        return 0.0
-    dot = 0.0
-    na = 0.0
-    nb = 0.0
-    for x, y in zip(a, b):
-        dot += x * y
-        na += x * x
-        nb += y * y
-    if na <= 0 or nb <= 0:
-        return 0.0
-    return dot / math.sqrt(na * nb)
+
+@app.on_event("shutdown")
+def on_shutdown_clip() -> None:
+    _EMBED_BATCHER.stop()
+
+
+def _numpy():
+    if numpy is None:
+        raise HTTPException(500, detail=f"numpy not available: {_NUMPY_ERROR}")
+    return numpy
+
+
+def pack_vectors(vecs: Any) -> Tuple[bytes, int]:
+    """
+    Encode one vector or a [K, D] stack as raw float16 bytes plus D. Rows are
+    L2-normalized first, so stored vectors score by plain dot product.
+    """
+    np = _numpy()
+    arr = np.asarray(vecs, dtype=np.float32)
+    if arr.ndim == 1:
+        arr = arr[None, :]
+    norms = np.linalg.norm(arr, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (arr / norms).astype(np.float16).tobytes(), int(arr.shape[1])
+
+
+def unpack_vectors(blob: bytes, dim: int) -> Any:
+    """
+    Decode pack_vectors() output into a float32 [K, D] array.
+    """
+    np = _numpy()
+    return np.frombuffer(blob, dtype=np.float16).reshape(-1, dim).astype(np.float32)
+
+
+# Above this many stored vectors the FAISS index switches from exact to HNSW
+COVER_INDEX_HNSW_MIN = 100_000
+
+
+class _CoverIndex:
+    """
+    L2-normalized float32 matrix of every stored cover vector, with rows grouped
+    by record. search() returns the top-k (record_id, best cosine over that
+    record's vectors) pairs, best first.
+
+    Uses FAISS (inner-product index) when the faiss package is installed and
+    falls back to one NumPy matrix product otherwise.
+    """
+
+    def __init__(self, candidates: List[Tuple[int, Any]]) -> None:
+        np = _numpy()
+        dims = [v.shape[1] for _, v in candidates if v.ndim == 2 and v.shape[0]]
+        # One CLIP model -> one dimension; anything else is stale and ignored
+        self.dim = max(set(dims), key=dims.count) if dims else 0
+        self.rec_ids: List[int] = []
+        starts: List[int] = []
+        owners: List[int] = []
+        blocks: List[Any] = []
+        n = 0
+        for rid, vecs in candidates:
+            if vecs.ndim != 2 or vecs.shape[0] == 0 or vecs.shape[1] != self.dim:
+                continue
+            starts.append(n)
+            owners.extend([len(self.rec_ids)] * vecs.shape[0])
+            self.rec_ids.append(rid)
+            blocks.append(vecs)
+            n += vecs.shape[0]
+        self.size = n
+        self.max_per_record = max((b.shape[0] for b in blocks), default=0)
+        self.starts = np.asarray(starts, dtype=np.intp)
+        self.owners = np.asarray(owners, dtype=np.int64)
+        self.faiss_index = None
+        if not blocks:
+            self.mat = np.zeros((0, 0), dtype=np.float32)
+            return
+
+        # L2-normalize rows once; zero vectors score 0 like before. Stored rows
+        # are unit length already; this corrects float16 rounding and rows
+        # written before pack_vectors normalized them
+        mat = np.ascontiguousarray(np.concatenate(blocks), dtype=np.float32)
+        norms = np.linalg.norm(mat, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        mat /= norms
+        self.mat = mat
+
+        try:
+            import faiss
+        except ImportError:
+            return
+        if n >= COVER_INDEX_HNSW_MIN:
+            index = faiss.IndexHNSWFlat(self.dim, 32, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efSearch = 64
+        else:
+            index = faiss.IndexFlatIP(self.dim)
+        index.add(mat)
+        self.faiss_index = index
+
+    def search(self, query_vec: List[float], k: int = 5) -> List[Tuple[int, float]]:
+        np = _numpy()
+        q = np.asarray(query_vec, dtype=np.float32)
+        if not self.size or q.shape[0] != self.dim:
+            return []
+        q_norm = float(np.linalg.norm(q))
+        if q_norm > 0:
+            q /= q_norm
+
+        if self.faiss_index is not None:
+            # The k best records' best vectors always fall within the top
+            # k * max_per_record rows, so grouping those rows is exact
+            want = min(self.size, k * self.max_per_record)
+            scores, rows = self.faiss_index.search(q[None, :], want)
+            best: Dict[int, float] = {}
+            for score, row in zip(scores[0], rows[0]):
+                if row < 0:
+                    continue
+                owner = int(self.owners[row])
+                if owner not in best:
+                    best[owner] = float(score)
+            ranked = sorted(best.items(), key=lambda x: x[1], reverse=True)[:k]
+            return [(self.rec_ids[o], s) for o, s in ranked]
+
+        scores = self.mat @ q
+        # Each record may have several vectors (augmentations); keep its best one
+        per_record = np.maximum.reduceat(scores, self.starts)
+        k = min(k, per_record.shape[0])
+        top = np.argpartition(-per_record, k - 1)[:k]
+        top = top[np.argsort(-per_record[top], kind="stable")]
+        return [(self.rec_ids[i], float(per_record[i])) for i in top]
 
 
 # =============================================================================
 # Cover proxy + cover-match + embeddings rebuild
 # =============================================================================
 
+def _local_cover_path(row: Any) -> Optional[str]:
+    # cover_local is a file path relative to the DB folder
+    path = (row["cover_local"] or "").strip()
+    return os.path.join(DB_DIR, path) if path else None
+
+
+def _read_local_cover(row: Any) -> Optional[bytes]:
+    path = _local_cover_path(row)
+    if not path:
+        return None
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except Exception:
+        return None
+
+
+def _cover_remote_url(row: Any) -> Optional[str]:
+    return row["cover_url"] or row["cover_url_auto"] or row["discogs_thumb"] or None
+
+
 def get_cover_bytes_for_record(row: sqlite3.Row) -> Optional[bytes]:
     """
     Try local cover_local (file path under DB folder) then URLs.
     """
-    # Local file path
-    path = (row["cover_local"] or "").strip()
-    if path:
-        try:
-            base = os.path.dirname(DB_PATH) or "."
-            path = os.path.join(base, path)
-            with open(path, "rb") as f:
-                return f.read()
-        except Exception:
-            pass
+    data = _read_local_cover(row)
+    if data:
+        return data
 
-    url = row["cover_url"] or row["cover_url_auto"] or row["discogs_thumb"]
+    url = _cover_remote_url(row)
     if not url:
         return None
 
+    session = _http_session()
     try:
-        import requests
-    except Exception as e:
-        raise HTTPException(500, detail=f"'requests' not installed: {e}")
+        with _REMOTE_COVER_SLOTS:
+            resp = session.get(url, timeout=REQUEST_TIMEOUT)
+        resp.raise_for_status()
+        return resp.content
+    except Exception:
+        return None
 
+
+async def fetch_remote_cover_async(url: str) -> Optional[bytes]:
+    """
+    Download a cover with the shared httpx client (for handlers on the event loop).
+    """
     try:
-        resp = requests.get(url, headers=_discogs_headers(), timeout=REQUEST_TIMEOUT)
+        resp = await _async_http().get(url)
         resp.raise_for_status()
         return resp.content
     except Exception:
         return None
 
 
-@app.get("/api/records/{rid}/cover/proxy")
-def cover_proxy(rid: int) -> Response:
-    conn = db()
-    cur = conn.cursor()
-    row = cur.execute("SELECT * FROM records WHERE id = ?", (rid,)).fetchone()
-    if not row:
-        conn.close()
-        raise HTTPException(404, detail="Record not found")
+# Browsers keep proxied covers for a day, then revalidate with If-None-Match
+COVER_CACHE_CONTROL = "public, max-age=86400"
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    inm = request.headers.get("if-none-match")
+    if not inm:
+        return False
+    return inm.strip() == "*" or etag in (t.strip() for t in inm.split(","))
 
-    data = get_cover_bytes_for_record(row)
-    conn.close()
+
+def _stat_file(path: str) -> Optional[os.stat_result]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
+@app.get("/api/records/{rid}/cover/proxy")
+async def cover_proxy(rid: int, request: Request) -> Response:
+    row = await asyncio.to_thread(db_get_record_or_404, rid)
+
+    # Local covers are sent straight from disk (sendfile) with a stat-based ETag
+    path = _local_cover_path(row)
+    st = await asyncio.to_thread(_stat_file, path) if path else None
+    if st is not None:
+        etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+        headers = {"ETag": etag, "Cache-Control": COVER_CACHE_CONTROL}
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        return FileResponse(path, media_type="image/jpeg", headers=headers, stat_result=st)
+
+    url = _cover_remote_url(row)
+    data = await fetch_remote_cover_async(url) if url else None
     if not data:
         raise HTTPException(404, detail="No cover data available")
 
-    return Response(content=data, media_type="image/jpeg")
+    etag = f'"{hashlib.md5(data, usedforsecurity=False).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": COVER_CACHE_CONTROL}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=data, media_type="image/jpeg", headers=headers)
 
 
-def get_all_cover_embeddings(conn: sqlite3.Connection) -> List[Tuple[int, List[List[float]]]]:
+def _vectors_from_json(text: str) -> Any:
+    """
+    Parse a legacy JSON vector (flat list or list of lists) into a float32
+    [K, D] array, or None when it is empty or malformed. Ragged lists raise.
     """
-    Return all stored cover embeddings as (record_id, [vectors...]) pairs.
+    raw = orjson.loads(text) if orjson is not None else json.loads(text)
+    if not isinstance(raw, list) or not raw:
+        return None
+    if isinstance(raw[0], list):
+        raw = [item for item in raw if isinstance(item, list)]
+    else:
+        raw = [raw]
+    np = _numpy()
+    arr = np.asarray(raw, dtype=np.float32)
+    return arr if arr.ndim == 2 and arr.shape[0] and arr.shape[1] else None
+
+
+def get_all_cover_embeddings(conn: sqlite3.Connection) -> List[Tuple[int, Any]]:
+    """
+    Return all stored cover embeddings as (record_id, float32 [K, D] array) pairs.
     Each record may have multiple vectors due to rotation augmentation.
+
+    Rows still holding legacy JSON text are converted to float16 blobs in place,
+    so each is parsed at most once.
     """
-    rows = conn.execute("SELECT record_id, vec FROM cover_embeddings").fetchall()
-    out: List[Tuple[int, List[List[float]]]] = []
+    rows = conn.execute("SELECT record_id, vec, vec_blob, vec_dim FROM cover_embeddings").fetchall()
+    out: List[Tuple[int, Any]] = []
+    migrated: List[Tuple[bytes, int, int]] = []
     for r in rows:
+        rid = int(r["record_id"])
         try:
-            raw = json.loads(r["vec"])
-            if not isinstance(raw, list):
+            if r["vec_blob"] is not None and r["vec_dim"]:
+                out.append((rid, unpack_vectors(r["vec_blob"], int(r["vec_dim"]))))
                 continue
-            if raw and isinstance(raw[0], (int, float, str)):
-                vecs = [[float(x) for x in raw]]
-            else:
-                vecs = []
-                for item in raw:
-                    if isinstance(item, list):
-                        vecs.append([float(x) for x in item])
-            out.append((int(r["record_id"]), vecs))
+            vecs = _vectors_from_json(r["vec"])
+            if vecs is None:
+                continue
+            blob, dim = pack_vectors(vecs)
+            migrated.append((blob, dim, rid))
+            out.append((rid, unpack_vectors(blob, dim)))
+        except HTTPException:
+            raise
         except Exception:
             continue
+    if migrated:
+        conn.executemany(
+            "UPDATE cover_embeddings SET vec_blob = ?, vec_dim = ?, vec = '' WHERE record_id = ?",
+            migrated,
+        )
     return out
 
 
+def db_get_record_titles(ids: List[int]) -> List[sqlite3.Row]:
+    placeholders = ",".join("?" for _ in ids)
+    with db() as conn:
+        return conn.execute(
+            f"SELECT id, artist, title FROM records WHERE id IN ({placeholders})",
+            ids,
+        ).fetchall()
+
+
+# Built from cover_embeddings on first use and reused until the
+# cover_embeddings_version counter moves (any process writing or deleting
+# embeddings bumps it), so each match costs one tiny SELECT when nothing changed.
+_COVER_INDEX: Optional[_CoverIndex] = None
+_COVER_INDEX_VERSION = -1
+_COVER_INDEX_LOCK = threading.Lock()
+_SELECT_EMBEDDINGS_VERSION_SQL = "SELECT value FROM kv WHERE k = 'cover_embeddings_version'"
+
+
+def get_cover_index() -> _CoverIndex:
+    global _COVER_INDEX, _COVER_INDEX_VERSION
+    with _COVER_INDEX_LOCK:
+        with db() as conn:
+            version = conn.execute(_SELECT_EMBEDDINGS_VERSION_SQL).fetchone()[0]
+            if _COVER_INDEX is None or version != _COVER_INDEX_VERSION:
+                candidates = get_all_cover_embeddings(conn)
+                # Re-read: migrating legacy JSON rows bumps the counter itself
+                version = conn.execute(_SELECT_EMBEDDINGS_VERSION_SQL).fetchone()[0]
+                _COVER_INDEX = _CoverIndex(candidates)
+                _COVER_INDEX_VERSION = version
+        return _COVER_INDEX
+
+
 @app.post("/api/cover-match")
 async def api_cover_match(file: UploadFile = File(...)) -> Dict[str, Any]:
     """
@@ -1261,116 +2524,155 @@ async def api_cover_match(file: UploadFile = File(...)) -> Dict[str, Any]:
     if not image_bytes:
         raise HTTPException(400, detail="Empty file upload")
 
-    query_vec = compute_image_embedding(image_bytes)
+    # Batched with concurrent uploads; inference runs in a worker thread
+    query_vec = await _EMBED_BATCHER.embed(image_bytes)
 
-    conn = db()
-    try:
-        candidates = get_all_cover_embeddings(conn)
-        if not candidates:
-            raise HTTPException(
-                404,
-                detail="No cover embeddings present. Populate them via /api/cover-embeddings/rebuild.",
-            )
+    index = await asyncio.to_thread(get_cover_index)
+    if not index.size:
+        raise HTTPException(
+            404,
+            detail="No cover embeddings present. Populate them via /api/cover-embeddings/rebuild.",
+        )
 
-        scored: List[Tuple[int, float]] = []
-        for rid, vecs in candidates:
-            if not vecs:
-                continue
-            # each record may have multiple vectors; take the best similarity
-            best_for_record = max(cosine_similarity(query_vec, v) for v in vecs)
-            scored.append((rid, best_for_record))
+    top = index.search(query_vec, k=5)
+    if not top:
+        raise HTTPException(404, detail="No valid embeddings to compare against.")
 
-        if not scored:
-            raise HTTPException(404, detail="No valid embeddings to compare against.")
+    best_id, best_score = top[0]
+    second_best_score = top[1][1] if len(top) > 1 else 0.0
+    gap = best_score - second_best_score
 
-        scored.sort(key=lambda x: x[1], reverse=True)
-        best_id, best_score = scored[0]
-        second_best_score = scored[1][1] if len(scored) > 1 else 0.0
-        gap = best_score - second_best_score
+    # Heuristic confidence rule
+    confident = (best_score >= 0.80) and (gap >= 0.10)
 
-        # Heuristic confidence rule
-        confident = (best_score >= 0.80) and (gap >= 0.10)
+    ids = [rid for rid, _ in top]
+    rows = await asyncio.to_thread(db_get_record_titles, ids)
+    meta_by_id = {int(r["id"]): r for r in rows}
 
-        top = scored[:5]
-        ids = [rid for rid, _ in top]
-        placeholders = ",".join("?" for _ in ids)
-        rows = conn.execute(
-            f"SELECT id, artist, title FROM records WHERE id IN ({placeholders})",
-            ids,
-        ).fetchall()
-        meta_by_id = {int(r["id"]): r for r in rows}
+    candidates_out: List[Dict[str, Any]] = []
+    for rid, score in top:
+        row = meta_by_id.get(int(rid))
+        candidates_out.append(
+            {
+                "id": int(rid),
+                "artist": (row["artist"] if row else None),
+                "title": (row["title"] if row else None),
+                "score": float(score),
+            }
+        )
 
-        candidates_out: List[Dict[str, Any]] = []
-        for rid, score in top:
-            row = meta_by_id.get(int(rid))
-            candidates_out.append(
-                {
-                    "id": int(rid),
-                    "artist": (row["artist"] if row else None),
-                    "title": (row["title"] if row else None),
-                    "score": float(score),
-                }
-            )
+    return {
+        "best": {
+            "id": int(best_id),
+            "score": float(best_score),
+            "gap_to_second": float(gap),
+        },
+        "candidates": candidates_out,
+        "confident": confident,
+    }
 
-        return {
-            "best": {
-                "id": int(best_id),
-                "score": float(best_score),
-                "gap_to_second": float(gap),
-            },
-            "candidates": candidates_out,
-            "confident": confident,
-        }
-    finally:
-        conn.close()
 
+_UPSERT_EMBEDDING_SQL = """
+    INSERT INTO cover_embeddings (record_id, vec, vec_blob, vec_dim, updated_at)
+    VALUES (?, '', ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(record_id) DO UPDATE SET
+      vec = excluded.vec,
+      vec_blob = excluded.vec_blob,
+      vec_dim = excluded.vec_dim,
+      updated_at = excluded.updated_at
+"""
 
-@app.post("/api/cover-embeddings/rebuild")
-def api_rebuild_cover_embeddings(limit: Optional[int] = Query(None)) -> Dict[str, Any]:
+
+def save_cover_embeddings(items: List[Tuple[int, List[List[float]]]]) -> None:
     """
-    Build (or refresh) cover embeddings for records that have an associated cover.
+    Upsert (record_id, [vectors...]) pairs into cover_embeddings as float16 blobs,
+    all in one transaction.
+    """
+    if not items:
+        return
+    packed = [(rid, *pack_vectors(vecs)) for rid, vecs in items]
+    with db() as conn:
+        conn.executemany(_UPSERT_EMBEDDING_SQL, packed)
+
+
+# Cover downloads kept in flight while the current batch is being embedded
+COVER_FETCH_WORKERS = 16
+COVER_PREFETCH = 64
+# At most this many of the workers hit the image CDN at once; the rest keep
+# reading local covers instead of queueing more remote requests
+COVER_REMOTE_CONCURRENCY = 8
+_REMOTE_COVER_SLOTS = threading.BoundedSemaphore(COVER_REMOTE_CONCURRENCY)
+
+
+def prefetch_cover_bytes(rows: List[sqlite3.Row]) -> Iterator[Tuple[sqlite3.Row, Optional[bytes]]]:
+    """
+    Yield (row, cover bytes) in row order while up to COVER_PREFETCH downloads run
+    ahead in a thread pool. Closing the iterator early cancels queued downloads.
     """
-    conn = db()
-    cur = conn.cursor()
-    rows = cur.execute("SELECT * FROM records ORDER BY id").fetchall()
+    pool = ThreadPoolExecutor(max_workers=COVER_FETCH_WORKERS)
+    try:
+        it = iter(rows)
+        window: deque = deque()
+        for row in islice(it, COVER_PREFETCH):
+            window.append((row, pool.submit(get_cover_bytes_for_record, row)))
+        while window:
+            row, fut = window.popleft()
+            nxt = next(it, None)
+            if nxt is not None:
+                window.append((nxt, pool.submit(get_cover_bytes_for_record, nxt)))
+            yield row, fut.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
 
+
+def build_cover_embeddings(rows: List[sqlite3.Row], limit: Optional[int]) -> Dict[str, Any]:
+    """
+    Download covers for rows, embed them CLIP_BATCH_SIZE at a time and store the
+    results. At most `limit` embeddings are produced when limit is given.
+    """
     processed = 0
     skipped_no_image = 0
     errors = 0
+    pending: List[Tuple[int, List[List[float]]]] = []
+    batch: List[Tuple[int, bytes]] = []
 
-    for row in rows:
-        if limit is not None and processed >= limit:
-            break
-
-        rid = int(row["id"])
-        data = get_cover_bytes_for_record(row)
-        if not data:
-            skipped_no_image += 1
-            continue
-
+    def flush() -> None:
+        nonlocal processed, errors
+        if not batch:
+            return
         try:
-            vec = compute_image_embedding(data)
-
-            vec_json = json.dumps([vec])  # store as list-of-vectors for future augmentation
-            cur.execute(
-                """
-                INSERT INTO cover_embeddings (record_id, vec, updated_at)
-                VALUES (?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(record_id) DO UPDATE SET
-                  vec = excluded.vec,
-                  updated_at = excluded.updated_at
-                """,
-                (rid, vec_json),
-            )
-            processed += 1
+            vecs = compute_image_embeddings_batch([data for _, data in batch])
         except HTTPException:
             raise
         except Exception:
-            errors += 1
+            vecs = [None] * len(batch)
+        for (rid, _), vec in zip(batch, vecs):
+            if vec is None:
+                errors += 1
+                continue
+            pending.append((rid, [vec]))  # list-of-vectors leaves room for augmentation
+            processed += 1
+        batch.clear()
+
+    covers = prefetch_cover_bytes(rows)
+    for row, data in covers:
+        # Queued images count toward limit so a batch never overshoots it
+        if limit is not None and processed + len(batch) >= limit:
+            flush()
+            if processed >= limit:
+                break
+
+        if not data:
+            skipped_no_image += 1
             continue
 
-    conn.commit()
-    conn.close()
+        batch.append((int(row["id"]), data))
+        if len(batch) >= CLIP_BATCH_SIZE:
+            flush()
+    covers.close()
+    flush()
+
+    save_cover_embeddings(pending)
 
     return {
         "processed": processed,
@@ -1379,69 +2681,34 @@ def api_rebuild_cover_embeddings(limit: Optional[int] = Query(None)) -> Dict[str
     }
 
 
+@app.post("/api/cover-embeddings/rebuild")
+def api_rebuild_cover_embeddings(limit: Optional[int] = Query(None)) -> Dict[str, Any]:
+    """
+    Build (or refresh) cover embeddings for records that have an associated cover.
+    """
+    with db() as conn:
+        rows = conn.execute("SELECT * FROM records ORDER BY id").fetchall()
+
+    return build_cover_embeddings(rows, limit)
+
+
 @app.post("/api/cover-embeddings/build-missing")
 def api_build_missing_cover_embeddings(limit: Optional[int] = Query(None)) -> Dict[str, Any]:
     """
     Build cover embeddings **only** for records that don't already have an entry
     in the cover_embeddings table.
     """
-    conn = db()
-    cur = conn.cursor()
-
     # Only select records that currently have NO embedding row
-    rows = cur.execute(
-        """
-        SELECT r.*
-        FROM records AS r
-        LEFT JOIN cover_embeddings AS ce
-          ON ce.record_id = r.id
-        WHERE ce.record_id IS NULL
-        ORDER BY r.id
-        """
-    ).fetchall()
-
-    processed = 0
-    skipped_no_image = 0
-    errors = 0
-
-    for row in rows:
-        # respect optional ?limit= query param, same as rebuild endpoint
-        if limit is not None and processed >= limit:
-            break
-
-        rid = int(row["id"])
-        data = get_cover_bytes_for_record(row)
-        if not data:
-            skipped_no_image += 1
-            continue
-
-        try:
-            vec = compute_image_embedding(data)
-
-            vec_json = json.dumps([vec])  # store as list-of-vectors for future augmentation
-            cur.execute(
-                """
-                INSERT INTO cover_embeddings (record_id, vec, updated_at)
-                VALUES (?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(record_id) DO UPDATE SET
-                  vec = excluded.vec,
-                  updated_at = excluded.updated_at
-                """,
-                (rid, vec_json),
-            )
-            processed += 1
-        except HTTPException:
-            # preserve the original behavior and let FastAPI handle this
-            raise
-        except Exception:
-            errors += 1
-            continue
-
-    conn.commit()
-    conn.close()
+    with db() as conn:
+        rows = conn.execute(
+            """
+            SELECT r.*
+            FROM records AS r
+            LEFT JOIN cover_embeddings AS ce
+              ON ce.record_id = r.id
+            WHERE ce.record_id IS NULL
+            ORDER BY r.id
+            """
+        ).fetchall()
 
-    return {
-        "processed": processed,
-        "skipped_no_image": skipped_no_image,
-        "errors": errors,
-    }
\ No newline at end of file
+    return build_cover_embeddings(rows, limit)
\ No newline at end of file